@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for the web research and build resolver tooling.
+
+Every benchmark runs against local servers or synthetic data, so results are
+reproducible on machines without network access.
+
+Usage: python benchmarks.py <benchmark> [options]
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from http_client import create_session
+from page_extract import fetch_html, extract_text_fast, extract_text_full, truncate_content
+
+
+class _StaticPageHandler(BaseHTTPRequestHandler):
+    """Serves a fixed HTML page over keep-alive HTTP/1.1"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    body = b'<html><head><title>bench</title></head><body>' + b'<p>pandas build log</p>' * 200 + b'</body></html>'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Clients that stop reading early (capped downloads) reset the connection
+        pass
+
+
+def start_server(handler):
+    """Start a threaded HTTP server on a free local port and return (server, base_url)"""
+    server = _QuietHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _summarize(label, timings):
+    timings_ms = [t * 1000 for t in timings]
+    print(f"{label:<28} mean {statistics.mean(timings_ms):7.3f} ms   "
+          f"p50 {statistics.median(timings_ms):7.3f} ms   "
+          f"max {max(timings_ms):7.3f} ms")
+
+
+def bench_http_pool(args):
+    """Per-fetch latency of one-off requests.get versus the shared pooled session"""
+    server, base_url = start_server(_StaticPageHandler)
+    url = f"{base_url}/page"
+
+    try:
+        unpooled = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            requests.get(url, timeout=10).content
+            unpooled.append(time.perf_counter() - start)
+
+        session = create_session()
+        pooled = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            session.get(url, timeout=10).content
+            pooled.append(time.perf_counter() - start)
+    finally:
+        server.shutdown()
+
+    print(f"{args.requests} sequential fetches of {url}")
+    _summarize("requests.get (no pooling)", unpooled)
+    _summarize("shared pooled session", pooled)
+
+
+def build_large_page(size_bytes):
+    """Synthetic Stack Overflow-like page: navigation, inline scripts, then the answer body"""
+    nav = '<nav>' + ''.join(f'<a href="/q/{i}">Related question {i}</a>' for i in range(200)) + '</nav>'
+    script = '<script>' + 'var x = {"tracking": [1, 2, 3]};' * 2000 + '</script>'
+    answer = ('<p>Install the build dependencies first: <code>pip install numpy cython</code>, '
+              'then rerun the pandas build with --no-build-isolation.</p>')
+    comment = '<div class="comment">This worked for me on Python 3.11 with setuptools 68.</div>'
+    head = f'<html><head><title>pandas build fails</title>{script}</head><body>{nav}<main>'
+    body = []
+    size = len(head)
+    while size < size_bytes:
+        block = answer + comment
+        body.append(block)
+        size += len(block)
+    return (head + ''.join(body) + '</main></body></html>').encode()
+
+
+def bench_html_extract(args):
+    """Full-document html.parser extraction versus the fast lxml path on large pages"""
+    html = build_large_page(args.page_kb * 1024)
+
+    class LargePageHandler(_StaticPageHandler):
+        body = html
+
+    server, base_url = start_server(LargePageHandler)
+    session = create_session()
+    url = f"{base_url}/large"
+
+    def full_path():
+        title, text = extract_text_full(fetch_html(session, url, max_bytes=None))
+        return truncate_content(text)
+
+    def fast_path():
+        title, text = extract_text_fast(fetch_html(session, url))
+        return truncate_content(text)
+
+    try:
+        results = {}
+        for label, func in [("full (html.parser)", full_path), ("fast (lxml, main content)", fast_path)]:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results[label] = func()
+                timings.append(time.perf_counter() - start)
+            _summarize(label, timings)
+    finally:
+        server.shutdown()
+
+    print(f"page size {len(html) / 1024:.0f} KiB")
+    for label, content in results.items():
+        print(f"  {label}: {content[:70]!r}")
+
+
+def bench_resolver_scrape(args):
+    """Throughput and latency of the resolver's scraping pipeline against the fixture server"""
+    import contextlib
+    import io
+    import os
+    import tempfile
+
+    from fixture_server import FixtureServer, load_fixtures
+    from main_pandas import ComprehensivePandasResolver
+
+    queries = [f"pandas build failure variant {i}" for i in range(args.queries)]
+    server = FixtureServer(load_fixtures(args.fixtures), latency=args.latency_ms / 1000,
+                           jitter=args.latency_ms / 2000, error_rate=args.error_rate, seed=1).start()
+    original_cwd = os.getcwd()
+
+    try:
+        print(f"{len(queries)} queries, {args.latency_ms:.0f} ms (+jitter) per response, "
+              f"error rate {args.error_rate:.0%}")
+        for workers in args.workers:
+            with tempfile.TemporaryDirectory() as workdir:
+                # Fresh caches per run so every request reaches the server
+                os.chdir(workdir)
+                resolver = ComprehensivePandasResolver(base_urls=server.base_urls())
+                served_before = server.requests_served
+
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results = resolver.enhanced_web_scraper(queries, max_workers=workers)
+                elapsed = time.perf_counter() - start
+                os.chdir(original_cwd)
+
+            requests_made = server.requests_served - served_before
+            print(f"workers={workers:<3} {elapsed:7.2f} s   {len(queries) / elapsed:7.1f} queries/s   "
+                  f"{requests_made} requests   {len(results)} unique results")
+    finally:
+        os.chdir(original_cwd)
+        server.stop()
+
+
+SYNTHETIC_LOG_LINES = [
+    "  copying pandas/core/frame.py -> build/lib.linux-x86_64-cpython-311/pandas/core",
+    "  running build_ext",
+    "  gcc -pthread -fno-strict-overflow -O2 -I/usr/include/python3.11 -c pandas/_libs/lib.c",
+    "  pandas/_libs/lib.c:1234:5: warning: unused variable 'x' [-Wunused-variable]",
+    "  Dependency on numpy: its headers won't be automatically included in the build",
+    "  Collecting numpy>=1.22.4",
+    "  Package 'pandas._libs.tslibs' is absent from the `packages` configuration.",
+    "  Downloading numpy-1.26.4-cp311-cp311-manylinux_2_17_x86_64.whl (18.3 MB)",
+    "  error: command 'gcc' failed with exit status 1",
+    "  ModuleNotFoundError: No module named 'Cython'",
+    "  Successfully installed numpy-1.26.4 python-dateutil-2.9.0 pytz-2024.1",
+]
+
+
+def write_synthetic_log(path, size_bytes, seed=0):
+    """Write a pip/setuptools-like build log of roughly size_bytes"""
+    import random
+
+    rng = random.Random(seed)
+    # Mostly uneventful build output with occasional matching lines
+    weights = [40, 30, 10, 6, 4, 4, 2, 2, 1, 0.5, 0.5]
+    block = '\n'.join(rng.choices(SYNTHETIC_LOG_LINES, weights=weights, k=20000)) + '\n'
+    written = 0
+    with open(path, 'w') as f:
+        while written < size_bytes:
+            f.write(block)
+            written += len(block)
+    return written
+
+
+def legacy_statistics(log_content):
+    """The original deep_log_analysis counting: one re.findall per pattern over the whole log"""
+    import re
+    from log_analysis import LOG_PATTERNS
+
+    return {category: len(re.findall(pattern, log_content, re.IGNORECASE))
+            for category, pattern in LOG_PATTERNS.items()}
+
+
+def bench_log_scan(args):
+    """Seven IGNORECASE re.findall passes versus the precompiled, case-folding LogScanner"""
+    import os
+    import re
+    import tempfile
+
+    from log_analysis import LogScanner
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'build.log')
+        size = write_synthetic_log(path, args.log_mb * 1024 * 1024)
+        with open(path) as f:
+            log_content = f.read()
+
+    print(f"synthetic log: {size / 1024 / 1024:.0f} MiB, {log_content.count(chr(10)):,} lines")
+
+    start = time.perf_counter()
+    legacy = legacy_statistics(log_content)
+    legacy_time = time.perf_counter() - start
+
+    scanner = LogScanner()
+    start = time.perf_counter()
+    single_pass = scanner.scan(log_content)
+    scan_time = time.perf_counter() - start
+
+    print(f"{'7 x re.findall':<28} {legacy_time:7.2f} s   {size / 1024 / 1024 / legacy_time:7.1f} MiB/s")
+    print(f"{'LogScanner.scan':<28} {scan_time:7.2f} s   {size / 1024 / 1024 / scan_time:7.1f} MiB/s")
+    print(f"statistics identical: {legacy == single_pass}")
+
+    # Custom patterns, including escapes whose meaning lower-casing would change
+    custom = {
+        'non_space_error': r"error:\S*",
+        'word_then_gap': r"Error\W+\w",
+        'not_digit': r"cp\D",
+        'word_edge': r"numpy\B",
+        'line_start': r"\A\s+Collecting",
+        'digits': r"\d+\.\d+\.\d+",
+    }
+    expected = {name: len(re.findall(pattern, log_content, re.IGNORECASE)) for name, pattern in custom.items()}
+    print(f"custom patterns identical: {LogScanner(custom).scan(log_content) == expected}")
+
+
+def _run_measured(code):
+    """Run a Python snippet in a fresh interpreter and return (wall seconds, peak RSS in MiB)"""
+    import os
+    import subprocess
+    import sys
+
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', code])
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        raise RuntimeError(f"benchmark child failed with exit code {process.returncode}")
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def bench_log_stream(args):
+    """Peak memory and time of in-memory analysis versus streaming a plain and gzip'd log"""
+    import gzip
+    import os
+    import shutil
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'build.log')
+        size = write_synthetic_log(path, args.log_mb * 1024 * 1024)
+        with open(path, 'rb') as src, gzip.open(path + '.gz', 'wb', compresslevel=1) as dst:
+            shutil.copyfileobj(src, dst)
+
+        print(f"synthetic log: {size / 1024 / 1024:.0f} MiB")
+        runs = [
+            ("read() + analyze_text", f"from log_analysis import analyze_text; analyze_text(open({path!r}).read())"),
+            ("analyze_file (plain)", f"from log_analysis import analyze_file; analyze_file({path!r})"),
+            ("analyze_file (gzip)", f"from log_analysis import analyze_file; analyze_file({path + '.gz'!r})"),
+        ]
+        for label, code in runs:
+            elapsed, peak_mib = _run_measured(code)
+            print(f"{label:<28} {elapsed:7.2f} s   peak RSS {peak_mib:7.0f} MiB")
+
+
+def bench_log_shard(args):
+    """Scaling of sharded log analysis across worker processes"""
+    import os
+    import tempfile
+
+    from log_analysis import FATAL_PATTERNS, analyze_file
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'build.log')
+        size = write_synthetic_log(path, args.log_mb * 1024 * 1024)
+        print(f"synthetic log: {size / 1024 / 1024:.0f} MiB on {os.cpu_count()} CPU(s)")
+
+        baseline = None
+        reference = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            analysis = analyze_file(path, workers=workers, fatal_patterns=FATAL_PATTERNS)
+            elapsed = time.perf_counter() - start
+
+            baseline = baseline or elapsed
+            reference = reference or analysis
+            print(f"workers={workers:<3} {elapsed:7.2f} s   {size / 1024 / 1024 / elapsed:7.1f} MiB/s   "
+                  f"speedup {baseline / elapsed:4.2f}x   identical: {analysis == reference}")
+
+        # The synthetic log fails early; also check a fatal line that only a later shard sees
+        with open(path, 'w') as f:
+            f.write("  running build_ext\n" * 200000 + "  error: subprocess-exited-with-error\n"
+                    + "  running build_ext\n" * 100000)
+        fatal = {workers: analyze_file(path, workers=workers, fatal_patterns=FATAL_PATTERNS)['fatal']
+                 for workers in args.workers}
+        print(f"late fatal line {fatal[args.workers[0]]['line']}, same for every worker count: "
+              f"{all(value == fatal[args.workers[0]] for value in fatal.values())}")
+
+
+def bench_ticket_import(args):
+    """Tickets per second filed one by one as the submit page does versus a batched bulk import"""
+    import os
+    import sqlite3
+    import tempfile
+
+    import database
+    from ticket_import import import_tickets
+
+    rows = [{'title': f"Ticket {n}", 'description': f"Synthetic backlog ticket number {n}",
+             'category': 'Software', 'priority': ('Critical', 'High', 'Medium', 'Low')[n % 4]}
+            for n in range(args.tickets)]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # The page helpers always use problem_solving.db in the working directory
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            database.init_db()
+            database.register_user('bench@localhost', 'bench', 'Benchmark')
+            user_id = database.authenticate_user('bench@localhost', 'bench')['id']
+            baseline_rows = rows[:min(args.tickets, 2000)]
+            collisions = 0
+            start = time.perf_counter()
+            for row in baseline_rows:
+                try:
+                    problem_id, _ = database.submit_problem(row['title'], row['description'], row['category'],
+                                                            row['priority'], user_id)
+                except sqlite3.IntegrityError:
+                    collisions += 1
+                    continue
+                database.add_calendar_event(problem_id, f"Deadline: {row['title']}", row['description'],
+                                            datetime.now() + timedelta(days=30), user_id)
+            elapsed = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+        print(f"{'submit_problem per ticket':<28} {len(baseline_rows):>8} tickets {elapsed:7.2f} s   "
+              f"{len(baseline_rows) / elapsed:9.0f} tickets/s   ticket id collisions: {collisions}")
+
+        for label, defer_indexes in (('import_tickets', False), ('import_tickets, deferred idx', True)):
+            db_path = os.path.join(workdir, f"bulk_{defer_indexes}.db")
+            start = time.perf_counter()
+            totals = import_tickets(rows, db_path=db_path, defer_indexes=defer_indexes)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<28} {totals['tickets']:>8} tickets {elapsed:7.2f} s   "
+                  f"{totals['tickets'] / elapsed:9.0f} tickets/s   calendar events: {totals['events']}")
+
+
+def legacy_ticket_id():
+    """The second-plus-four-random-letters ticket id submit_problem used to generate"""
+    import random
+
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    return f"TKT-{timestamp}-{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=4))}"
+
+
+def _ticket_writer(workdir, submissions, bulk_tickets):
+    """One parallel writer: tickets filed one by one through submit_problem, then a bulk import"""
+    import os
+
+    import database
+    from ticket_import import import_tickets
+
+    os.chdir(workdir)
+    user_id = database.authenticate_user('bench@localhost', 'bench')['id']
+    ticket_ids = [database.submit_problem(f"Ticket {n}", "Parallel writer ticket", 'Software', 'Medium', user_id)[1]
+                  for n in range(submissions)]
+    rows = [{'title': f"Bulk ticket {n}", 'description': "Parallel writer bulk ticket"} for n in range(bulk_tickets)]
+    import_tickets(rows, batch_size=1000, defer_indexes=False)
+    return ticket_ids
+
+
+def bench_ticket_ids(args):
+    """Ticket id generation rate and a stress test of parallel processes filing tickets into one database"""
+    import multiprocessing
+    import os
+    import sqlite3
+    import tempfile
+
+    import database
+    from ticket_ids import new_ticket_ids
+
+    count = args.tickets
+    start = time.perf_counter()
+    legacy = [legacy_ticket_id() for _ in range(count)]
+    legacy_time = time.perf_counter() - start
+    start = time.perf_counter()
+    ids = new_ticket_ids(count)
+    elapsed = time.perf_counter() - start
+    print(f"{'legacy generate_ticket_id':<28} {count / legacy_time:10.0f} ids/s   "
+          f"duplicates: {count - len(set(legacy))}")
+    print(f"{'new_ticket_ids':<28} {count / elapsed:10.0f} ids/s   duplicates: {count - len(set(ids))}   "
+          f"strictly increasing: {all(a < b for a, b in zip(ids, ids[1:]))}")
+
+    writers = max(args.workers)
+    submissions, bulk_tickets = 200, count // writers
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            database.init_db()
+            database.register_user('bench@localhost', 'bench', 'Benchmark')
+        finally:
+            os.chdir(cwd)
+
+        # fork, so the writers start from a copy of this process's generator state
+        context = multiprocessing.get_context('fork')
+        start = time.perf_counter()
+        with context.Pool(writers) as pool:
+            results = pool.starmap(_ticket_writer, [(workdir, submissions, bulk_tickets)] * writers)
+        elapsed = time.perf_counter() - start
+
+        conn = sqlite3.connect(os.path.join(workdir, 'problem_solving.db'))
+        total, distinct = conn.execute('SELECT COUNT(*), COUNT(DISTINCT ticket_id) FROM problems').fetchone()
+        conn.close()
+        expected = writers * (submissions + bulk_tickets)
+        print(f"{writers} parallel writers: {total} tickets in {elapsed:.2f} s ({total / elapsed:.0f} tickets/s)   "
+              f"expected: {expected}   distinct ids: {distinct}   per-writer ids increasing: "
+              f"{all(all(a < b for a, b in zip(ids, ids[1:])) for ids in results)}")
+
+
+BENCHMARKS = {
+    'http-pool': bench_http_pool,
+    'html-extract': bench_html_extract,
+    'resolver-scrape': bench_resolver_scrape,
+    'log-scan': bench_log_scan,
+    'log-stream': bench_log_stream,
+    'log-shard': bench_log_shard,
+    'ticket-import': bench_ticket_import,
+    'ticket-ids': bench_ticket_ids,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run performance benchmarks")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--requests', type=int, default=200, help="Requests per measurement")
+    parser.add_argument('--page-kb', type=int, default=4096, help="Synthetic page size for html-extract")
+    parser.add_argument('--repeat', type=int, default=5, help="Repetitions per measurement")
+    parser.add_argument('--fixtures', default='fixtures/resolver_api.json', help="Fixture file for resolver-scrape")
+    parser.add_argument('--queries', type=int, default=20, help="Search queries for resolver-scrape")
+    parser.add_argument('--latency-ms', type=float, default=50, help="Simulated API latency for resolver-scrape")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Injected 500 rate for resolver-scrape")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help="Worker counts to compare")
+    parser.add_argument('--log-mb', type=int, default=500, help="Synthetic build log size for log benchmarks")
+    parser.add_argument('--tickets', type=int, default=100000, help="Synthetic tickets for ticket-import and ticket-ids")
+    args = parser.parse_args()
+
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Streaming command runner for the resolver's solution attempts.
+
+A command's combined stdout and stderr are read from the pipe as they are
+produced and fed to the build log analyzer straight away, so progress can be
+shown live and a fatal build error can stop the command at once. Only the
+last max_output_bytes of output are kept in memory however much a build
+prints; the complete log can be written to a file as it streams. Where
+os.wait4 is available the child is reaped with it, which reports its CPU
+time and peak resident set size alongside the wall time.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from log_analysis import FATAL_PATTERNS, StreamingLogAnalyzer, compile_fatal_patterns, find_fatal
+
+MAX_OUTPUT_BYTES = 256 * 1024
+READ_SIZE = 64 * 1024
+POLL_INTERVAL = 0.05
+
+
+def _reap(process, block):
+    """Collect the process's exit status; returns (exited, rusage or None)"""
+    if hasattr(os, 'wait4'):
+        pid, status, usage = os.wait4(process.pid, 0 if block else os.WNOHANG)
+        if pid == 0:
+            return False, None
+        # Let Popen know the child is gone so it never waits for it again
+        process.returncode = os.waitstatus_to_exitcode(status)
+        return True, usage
+
+    if block:
+        process.wait()
+    return process.poll() is not None, None
+
+
+def _signal_group(process, sig):
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(process.pid, sig)
+        elif sig == signal.SIGTERM:
+            process.terminate()
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def stop_process(process, grace=10):
+    """Terminate a command and the processes it started, then reap it; returns its rusage"""
+    _signal_group(process, signal.SIGTERM)
+    deadline = time.monotonic() + grace
+    while time.monotonic() < deadline:
+        exited, usage = _reap(process, block=False)
+        if exited:
+            return usage
+        time.sleep(POLL_INTERVAL)
+    _signal_group(process, getattr(signal, 'SIGKILL', signal.SIGTERM))
+    return _reap(process, block=True)[1]
+
+
+def run_command(argv, timeout=300, cancel=None, stop_on_fatal=False, log_path=None,
+                max_output_bytes=MAX_OUTPUT_BYTES, on_line=None, scanner=None,
+                fatal_patterns=FATAL_PATTERNS):
+    """Run a command, streaming its output through the build log analyzer.
+
+    The command is stopped early when the cancel event is set, after timeout
+    seconds or, with stop_on_fatal, at the first line matching
+    fatal_patterns. on_line(line)
+    is called for every line as it arrives. Returns a dict with 'returncode',
+    the retained end of the output ('output', 'output_truncated'), the
+    build log 'analysis', the first 'fatal' line, why the command was
+    'stopped' ('fatal', 'cancelled', 'timeout' or None), and 'wall_seconds',
+    'cpu_seconds' and 'peak_rss_bytes' (None where the platform does not
+    report them). A command stopped at the timeout has returncode None.
+    """
+    analyzer = StreamingLogAnalyzer(scanner)
+    fatal_pattern = compile_fatal_patterns(fatal_patterns)
+    fatal_seen = threading.Event()
+    state = {'fatal': None, 'truncated': False}
+    retained = bytearray()
+
+    def handle(text):
+        first_line = analyzer.lines + 1
+        analyzer.feed(text)
+        if state['fatal'] is None:
+            state['fatal'] = find_fatal(fatal_pattern, text, first_line)
+            if state['fatal']:
+                fatal_seen.set()
+        if on_line:
+            for line in text.splitlines():
+                on_line(line)
+
+    def pump():
+        remainder = b''
+        while True:
+            block = os.read(process.stdout.fileno(), READ_SIZE)
+            if not block:
+                break
+            if log:
+                log.write(block)
+            retained.extend(block)
+            if len(retained) > max_output_bytes:
+                del retained[:len(retained) - max_output_bytes]
+                state['truncated'] = True
+
+            data = remainder + block
+            cut = data.rfind(b'\n') + 1
+            if cut == 0 and len(data) > max_output_bytes:
+                # A runaway line; analyze it in pieces rather than hold it all
+                cut = len(data)
+            remainder = data[cut:]
+            if cut:
+                handle(data[:cut].decode('utf-8', errors='replace'))
+        if remainder:
+            handle(remainder.decode('utf-8', errors='replace'))
+
+    log = open(log_path, 'wb') if log_path else None
+    started = time.monotonic()
+    try:
+        process = subprocess.Popen(argv, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT, start_new_session=True)
+    except OSError:
+        if log:
+            log.close()
+        raise
+    reader = threading.Thread(target=pump, daemon=True)
+    reader.start()
+
+    usage = None
+    stopped = None
+    try:
+        while True:
+            exited, usage = _reap(process, block=False)
+            if exited:
+                break
+            if stop_on_fatal and fatal_seen.is_set():
+                stopped = 'fatal'
+            elif cancel is not None and cancel.is_set():
+                stopped = 'cancelled'
+            elif time.monotonic() - started > timeout:
+                stopped = 'timeout'
+            if stopped:
+                usage = stop_process(process)
+                break
+            time.sleep(POLL_INTERVAL)
+    finally:
+        if process.returncode is None:
+            stop_process(process)
+        reader.join(timeout=5)
+        if reader.is_alive():
+            # Something the command started still holds the pipe open
+            _signal_group(process, getattr(signal, 'SIGKILL', signal.SIGTERM))
+            reader.join(timeout=5)
+        if not reader.is_alive():
+            process.stdout.close()
+            if log:
+                log.close()
+
+    analysis = analyzer.result()
+    analysis['fatal'] = state['fatal']
+    return {
+        'returncode': None if stopped == 'timeout' else process.returncode,
+        'output': retained.decode('utf-8', errors='replace'),
+        'output_truncated': state['truncated'],
+        'analysis': analysis,
+        'fatal': state['fatal'],
+        'stopped': stopped,
+        'wall_seconds': time.monotonic() - started,
+        'cpu_seconds': usage.ru_utime + usage.ru_stime if usage else None,
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        'peak_rss_bytes': usage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024) if usage else None,
+    }
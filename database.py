@@ -0,0 +1,407 @@
+"""
+Database layer of the problem solving platform.
+
+The schema and the queries the Streamlit pages make, kept free of UI
+dependencies so import jobs and benchmarks can use them headless. Every
+function works on problem_solving.db in the working directory.
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime, timedelta
+
+from ticket_ids import TICKET_ID_ATTEMPTS, is_ticket_id_collision, new_ticket_id
+
+# Initialize database with enhanced tables
+def init_db(db_path='problem_solving.db'):
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    
+    # Users table
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            name TEXT NOT NULL,
+            role TEXT DEFAULT 'user',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Enhanced Problems table (now tickets)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS problems (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ticket_id TEXT UNIQUE NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            category TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            status TEXT DEFAULT 'submitted',
+            submitted_by INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            deadline TIMESTAMP,
+            assigned_to INTEGER,
+            resolution TEXT,
+            resolved_at TIMESTAMP,
+            FOREIGN KEY (submitted_by) REFERENCES users (id),
+            FOREIGN KEY (assigned_to) REFERENCES users (id)
+        )
+    ''')
+    
+    # Assignments table
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS assignments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            problem_id INTEGER,
+            user_id INTEGER,
+            assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'assigned',
+            FOREIGN KEY (problem_id) REFERENCES problems (id),
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    
+    # Calendar events table
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS calendar_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            problem_id INTEGER,
+            title TEXT NOT NULL,
+            description TEXT,
+            event_date TIMESTAMP NOT NULL,
+            created_by INTEGER,
+            FOREIGN KEY (problem_id) REFERENCES problems (id),
+            FOREIGN KEY (created_by) REFERENCES users (id)
+        )
+    ''')
+    
+    # File attachments table
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS file_attachments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            problem_id INTEGER,
+            filename TEXT NOT NULL,
+            file_data BLOB NOT NULL,
+            file_type TEXT NOT NULL,
+            uploaded_by INTEGER,
+            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (problem_id) REFERENCES problems (id),
+            FOREIGN KEY (uploaded_by) REFERENCES users (id)
+        )
+    ''')
+    
+    # Search results table
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS search_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            problem_id INTEGER,
+            search_query TEXT NOT NULL,
+            result_title TEXT,
+            result_url TEXT,
+            result_snippet TEXT,
+            search_engine TEXT,
+            searched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (problem_id) REFERENCES problems (id)
+        )
+    ''')
+    
+    # Build failures imported from resolver reports, one ticket per log signature
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS imported_reports (
+            log_signature TEXT PRIMARY KEY,
+            problem_id INTEGER NOT NULL,
+            occurrences INTEGER DEFAULT 1,
+            first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (problem_id) REFERENCES problems (id)
+        )
+    ''')
+    
+    # Indexes for the per-user and per-ticket lookups the pages make
+    c.execute('CREATE INDEX IF NOT EXISTS idx_problems_submitted_by ON problems (submitted_by)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_calendar_events_problem ON calendar_events (problem_id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_calendar_events_date ON calendar_events (event_date)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_file_attachments_problem ON file_attachments (problem_id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_search_results_problem ON search_results (problem_id)')
+    
+    conn.commit()
+    conn.close()
+
+# Generate unique ticket ID
+def generate_ticket_id():
+    return new_ticket_id()
+
+# Hash password
+def hash_password(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+# User authentication
+def authenticate_user(email, password):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    hashed_password = hash_password(password)
+    
+    c.execute('SELECT * FROM users WHERE email = ? AND password = ?', 
+              (email, hashed_password))
+    user = c.fetchone()
+    conn.close()
+    
+    if user:
+        return {
+            'id': user[0],
+            'email': user[1],
+            'name': user[3],
+            'role': user[4]
+        }
+    return None
+
+# Register new user
+def register_user(email, password, name, role='user'):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    hashed_password = hash_password(password)
+    
+    try:
+        c.execute('INSERT INTO users (email, password, name, role) VALUES (?, ?, ?, ?)',
+                  (email, hashed_password, name, role))
+        conn.commit()
+        conn.close()
+        return True
+    except sqlite3.IntegrityError:
+        conn.close()
+        return False
+
+# Enhanced problem submission with ticket ID
+def submit_problem(title, description, category, priority, submitted_by, deadline_days=30):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    deadline = datetime.now() + timedelta(days=deadline_days)
+    
+    try:
+        for attempt in range(TICKET_ID_ATTEMPTS):
+            ticket_id = generate_ticket_id()
+            try:
+                c.execute('''
+                    INSERT INTO problems (ticket_id, title, description, category, priority, submitted_by, deadline)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (ticket_id, title, description, category, priority, submitted_by, deadline))
+                break
+            except sqlite3.IntegrityError as e:
+                if not is_ticket_id_collision(e) or attempt == TICKET_ID_ATTEMPTS - 1:
+                    raise
+        
+        problem_id = c.lastrowid
+        conn.commit()
+    finally:
+        conn.close()
+    return problem_id, ticket_id
+
+# Get all problems
+def get_all_problems():
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    
+    c.execute('''
+        SELECT p.*, u.name as submitted_by_name, u2.name as assigned_to_name
+        FROM problems p 
+        LEFT JOIN users u ON p.submitted_by = u.id 
+        LEFT JOIN users u2 ON p.assigned_to = u2.id
+        ORDER BY p.created_at DESC
+    ''')
+    problems = c.fetchall()
+    conn.close()
+    
+    return problems
+
+# Get user's submitted problems
+def get_user_problems(user_id):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    
+    c.execute('''
+        SELECT p.*, u.name as submitted_by_name, u2.name as assigned_to_name
+        FROM problems p 
+        LEFT JOIN users u ON p.submitted_by = u.id 
+        LEFT JOIN users u2 ON p.assigned_to = u2.id
+        WHERE p.submitted_by = ?
+        ORDER BY p.created_at DESC
+    ''', (user_id,))
+    problems = c.fetchall()
+    conn.close()
+    
+    return problems
+
+# Assign user to problem
+def assign_to_problem(problem_id, user_id):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    
+    # Update the main problem assignment
+    c.execute('UPDATE problems SET assigned_to = ? WHERE id = ?', (user_id, problem_id))
+    
+    # Check if already assigned in assignments table
+    c.execute('SELECT * FROM assignments WHERE problem_id = ? AND user_id = ?', 
+              (problem_id, user_id))
+    existing = c.fetchone()
+    
+    if not existing:
+        c.execute('INSERT INTO assignments (problem_id, user_id) VALUES (?, ?)', 
+                  (problem_id, user_id))
+    
+    conn.commit()
+    conn.close()
+    return True
+
+# Get assignments for problem
+def get_problem_assignments(problem_id):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    
+    c.execute('''
+        SELECT a.*, u.name as user_name 
+        FROM assignments a 
+        JOIN users u ON a.user_id = u.id 
+        WHERE a.problem_id = ?
+    ''', (problem_id,))
+    assignments = c.fetchall()
+    conn.close()
+    
+    return assignments
+
+# Add calendar event
+def add_calendar_event(problem_id, title, description, event_date, created_by):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    
+    c.execute('''
+        INSERT INTO calendar_events (problem_id, title, description, event_date, created_by)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (problem_id, title, description, event_date, created_by))
+    
+    conn.commit()
+    conn.close()
+
+# Get calendar events
+def get_calendar_events(user_id=None):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    
+    if user_id:
+        c.execute('''
+            SELECT ce.*, p.title as problem_title, u.name as created_by_name
+            FROM calendar_events ce
+            JOIN problems p ON ce.problem_id = p.id
+            JOIN users u ON ce.created_by = u.id
+            WHERE ce.created_by = ? OR ce.problem_id IN (
+                SELECT problem_id FROM assignments WHERE user_id = ?
+            )
+            ORDER BY ce.event_date
+        ''', (user_id, user_id))
+    else:
+        c.execute('''
+            SELECT ce.*, p.title as problem_title, u.name as created_by_name
+            FROM calendar_events ce
+            JOIN problems p ON ce.problem_id = p.id
+            JOIN users u ON ce.created_by = u.id
+            ORDER BY ce.event_date
+        ''')
+    
+    events = c.fetchall()
+    conn.close()
+    return events
+
+# File attachment functions
+def save_file_attachment(problem_id, filename, file_data, file_type, uploaded_by):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    
+    c.execute('''
+        INSERT INTO file_attachments (problem_id, filename, file_data, file_type, uploaded_by)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (problem_id, filename, file_data, file_type, uploaded_by))
+    
+    conn.commit()
+    conn.close()
+
+def get_file_attachments(problem_id):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    
+    c.execute('''
+        SELECT fa.*, u.name as uploaded_by_name
+        FROM file_attachments fa
+        JOIN users u ON fa.uploaded_by = u.id
+        WHERE fa.problem_id = ?
+        ORDER BY fa.uploaded_at DESC
+    ''', (problem_id,))
+    
+    attachments = c.fetchall()
+    conn.close()
+    return attachments
+
+def get_file_attachment(file_id):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    
+    c.execute('SELECT * FROM file_attachments WHERE id = ?', (file_id,))
+    attachment = c.fetchone()
+    conn.close()
+    return attachment
+
+# Search functions
+def save_search_result(problem_id, search_query, result_title, result_url, result_snippet, search_engine):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    
+    c.execute('''
+        INSERT INTO search_results (problem_id, search_query, result_title, result_url, result_snippet, search_engine)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (problem_id, search_query, result_title, result_url, result_snippet, search_engine))
+    
+    conn.commit()
+    conn.close()
+
+def get_search_results(problem_id):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    
+    c.execute('''
+        SELECT * FROM search_results 
+        WHERE problem_id = ? 
+        ORDER BY searched_at DESC
+    ''', (problem_id,))
+    
+    results = c.fetchall()
+    conn.close()
+    return results
+
+# Update problem status
+def update_problem_status(problem_id, new_status, resolution=None):
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    
+    if new_status == 'solved' and resolution:
+        c.execute('''
+            UPDATE problems 
+            SET status = ?, resolution = ?, resolved_at = CURRENT_TIMESTAMP 
+            WHERE id = ?
+        ''', (new_status, resolution, problem_id))
+    else:
+        c.execute('UPDATE problems SET status = ? WHERE id = ?', (new_status, problem_id))
+    
+    conn.commit()
+    conn.close()
+
+# Get all users for assignment
+def get_all_users():
+    conn = sqlite3.connect('problem_solving.db')
+    c = conn.cursor()
+    c.execute('SELECT id, name, email, role, created_at FROM users')
+    users = c.fetchall()
+    conn.close()
+    return users
+
+# Priority mapping for sorting
+PRIORITY_ORDER = {'Critical': 1, 'High': 2, 'Medium': 3, 'Low': 4}
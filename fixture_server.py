@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the StackExchange, GitHub and PyPI APIs.
+
+Replays recorded responses over HTTP so the pandas build resolver can be
+tested and benchmarked on machines without network access. Each source is
+served under its own path prefix; point the resolver at it with
+ComprehensivePandasResolver(base_urls=server.base_urls()).
+
+Usage:
+    python fixture_server.py serve --fixtures fixtures/resolver_api.json --latency-ms 80
+    python fixture_server.py record --out fixtures/resolver_api.json --query "pandas build numpy"
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+from main_pandas import DEFAULT_BASE_URLS
+from pypi_client import BUILD_PACKAGES
+
+
+class FixtureServer:
+    """Threaded HTTP server replaying fixtures with injectable latency and errors.
+
+    fixtures maps a source name (a key of DEFAULT_BASE_URLS) to a list of
+    responses: {"path", "match" (optional query substring), "status",
+    "headers", and either "json" or "body"}. A request is answered by the
+    first entry for its source and path whose match appears in the query
+    string; unknown paths get a 404.
+    """
+
+    def __init__(self, fixtures, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0,
+                 host='127.0.0.1', port=0, seed=None):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.requests_served = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_urls(self):
+        """Resolver base_urls pointing every source at this server"""
+        return {source: f"{self.url}/{source}" for source in DEFAULT_BASE_URLS}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def find_fixture(self, path, query):
+        source, _, source_path = path.lstrip('/').partition('/')
+        for fixture in self.fixtures.get(source, []):
+            if fixture['path'] == '/' + source_path and fixture.get('match', '') in query:
+                return fixture
+        return None
+
+    def _roll(self):
+        with self._lock:
+            self.requests_served += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            outcome = self._random.random()
+        if outcome < self.error_rate:
+            return delay, 'error'
+        if outcome < self.error_rate + self.throttle_rate:
+            return delay, 'throttle'
+        return delay, 'ok'
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def _reply(self, status, body=b'', headers=None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                delay, outcome = server._roll()
+                if delay:
+                    time.sleep(delay)
+
+                if outcome == 'error':
+                    return self._reply(500, b'Injected server error')
+                if outcome == 'throttle':
+                    return self._reply(429, b'Injected rate limit', {'Retry-After': '1'})
+
+                parts = urlsplit(self.path)
+                fixture = server.find_fixture(parts.path, parts.query)
+                if fixture is None:
+                    return self._reply(404, b'No fixture for this path')
+
+                if 'json' in fixture:
+                    body = json.dumps(fixture['json']).encode()
+                    headers = {'Content-Type': 'application/json'}
+                else:
+                    body = fixture.get('body', '').encode()
+                    headers = {'Content-Type': 'text/html; charset=utf-8'}
+                headers.update(fixture.get('headers', {}))
+                self._reply(fixture.get('status', 200), body, headers)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def load_fixtures(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _record_stackexchange(query, timeout):
+    response = requests.get(f"{DEFAULT_BASE_URLS['stackexchange_api']}/2.3/search/advanced", timeout=timeout, params={
+        'order': 'desc', 'sort': 'relevance', 'q': query, 'site': 'stackoverflow', 'pagesize': 5
+    })
+    return {'path': '/2.3/search/advanced', 'status': response.status_code, 'json': response.json()}
+
+
+def _record_github(query, timeout):
+    response = requests.get(f"{DEFAULT_BASE_URLS['github_api']}/search/issues", timeout=timeout, params={
+        'q': f'repo:pandas-dev/pandas {query}', 'sort': 'created', 'order': 'desc', 'per_page': 5
+    }, headers={'Accept': 'application/vnd.github.v3+json', 'User-Agent': 'Pandas-Build-Helper/1.0'})
+    data = response.json()
+    # Keep only the fields the resolver reads
+    data['items'] = [{key: item[key] for key in ('title', 'html_url', 'state', 'created_at')}
+                     for item in data.get('items', [])]
+    return {'path': '/search/issues', 'status': response.status_code, 'json': data}
+
+
+def _record_pypi(package, max_releases, timeout):
+    response = requests.get(f"{DEFAULT_BASE_URLS['pypi']}/pypi/{package}/json", timeout=timeout)
+    data = response.json()
+    # Trim to the newest releases so the fixture file stays small
+    releases = data['releases']
+    latest = sorted(releases, key=lambda v: releases[v][0]['upload_time'] if releases[v] else '')[-max_releases:]
+    return {'path': f'/pypi/{package}/json', 'status': response.status_code, 'json': {
+        'info': {key: data['info'].get(key) for key in ('name', 'version', 'summary', 'requires_python')},
+        'releases': {version: [{key: file.get(key) for key in ('filename', 'packagetype', 'requires_python', 'yanked')}
+                               for file in releases[version]] for version in latest}
+    }}
+
+
+def record_fixtures(queries, max_releases=5, timeout=15, fixtures=None):
+    """Fetch the live API responses the resolver uses and add them to fixtures.
+
+    Sources that cannot be reached are reported and keep whatever fixtures
+    they already had.
+    """
+    fixtures = fixtures or {source: [] for source in DEFAULT_BASE_URLS}
+    jobs = [('stackexchange_api', _record_stackexchange, (query, timeout)) for query in queries]
+    jobs += [('github_api', _record_github, (query, timeout)) for query in queries]
+    jobs += [('pypi', _record_pypi, (package, max_releases, timeout)) for package in BUILD_PACKAGES]
+
+    recorded = {}
+    for source, record, args in jobs:
+        try:
+            recorded.setdefault(source, []).append(record(*args))
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"Skipping {source} {args[0]}: {e}")
+            recorded.setdefault(source, None)
+
+    for source, entries in recorded.items():
+        if entries:
+            fixtures[source] = [entry for entry in entries if entry]
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the resolver's web APIs")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve = subparsers.add_parser('serve', help="Replay fixtures over HTTP")
+    serve.add_argument('--fixtures', default='fixtures/resolver_api.json')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--latency-ms', type=float, default=0, help="Fixed delay added to every response")
+    serve.add_argument('--jitter-ms', type=float, default=0, help="Random extra delay up to this value")
+    serve.add_argument('--error-rate', type=float, default=0, help="Fraction of requests answered with 500")
+    serve.add_argument('--throttle-rate', type=float, default=0, help="Fraction of requests answered with 429")
+
+    record = subparsers.add_parser('record', help="Record live API responses into a fixture file")
+    record.add_argument('--out', default='fixtures/resolver_api.json')
+    record.add_argument('--query', action='append', required=True)
+    record.add_argument('--max-releases', type=int, default=5)
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        try:
+            existing = load_fixtures(args.out)
+        except FileNotFoundError:
+            existing = None
+        fixtures = record_fixtures(args.query, max_releases=args.max_releases, fixtures=existing)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(fixtures, f, indent=1)
+        print(f"Recorded {sum(len(v) for v in fixtures.values())} responses to {args.out}")
+        return
+
+    server = FixtureServer(load_fixtures(args.fixtures), latency=args.latency_ms / 1000,
+                           jitter=args.jitter_ms / 1000, error_rate=args.error_rate,
+                           throttle_rate=args.throttle_rate, port=args.port)
+    print(f"Serving fixtures on {server.url}")
+    for source, url in server.base_urls().items():
+        print(f"  {source}: {url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
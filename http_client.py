@@ -0,0 +1,264 @@
+"""
+Shared HTTP client for the web research features.
+
+Pooled requests.Sessions are reused across fetches, so repeated requests to
+the same host skip DNS, TCP and TLS setup, and transient server errors are
+retried with exponential backoff. The pandas build resolver's session also
+spaces out requests to rate-limited APIs per host and stops calling hosts
+that keep failing; the Streamlit app fetches arbitrary result pages through
+a separate session without those limits, so one slow or failing site never
+holds back the others.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+# Requests per second and burst size for hosts with published or observed limits.
+# Hosts not listed here are not throttled.
+DEFAULT_HOST_LIMITS = {
+    'api.stackexchange.com': (5, 5),
+    'stackoverflow.com': (1, 2),
+    'api.github.com': (10 / 60, 10),  # unauthenticated search API: 10 requests/minute
+    'github.com': (1, 2),
+    'pypi.org': (10, 10),
+}
+
+_session = None
+_page_session = None
+_session_lock = threading.Lock()
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request to a host that is currently blocked"""
+
+
+class RateLimitedError(requests.exceptions.HTTPError):
+    """Raised by callers when an API answered with a rate limit response"""
+
+
+def is_rate_limited(response):
+    """True for 429s and for 403s that report an exhausted rate limit"""
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and (
+        response.headers.get('X-RateLimit-Remaining') == '0' or 'Retry-After' in response.headers
+    )
+
+
+def _retry_after_seconds(value):
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class RateLimiter:
+    """Per-host token buckets with server-driven backoff and circuit breaking.
+
+    Configured hosts are paced by a token bucket. For every host, rate limit
+    responses (Retry-After, X-RateLimit-Remaining/Reset, 429) pause further
+    requests until the server says it is safe, and repeated failures open a
+    circuit that rejects requests for a cooldown period. A pause longer than
+    max_wait also opens the circuit rather than stalling a batch run.
+    """
+
+    def __init__(self, limits=None, failure_threshold=5, cooldown=60, max_wait=60, base_backoff=2):
+        self.limits = dict(limits or {})
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_wait = max_wait
+        self.base_backoff = base_backoff
+        self._buckets = {}
+        self._paused_until = {}
+        self._circuit_open_until = {}
+        self._failures = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host, rate, burst=1):
+        with self._lock:
+            self.limits[host] = (rate, burst)
+            self._buckets.pop(host, None)
+
+    def _metric(self, host, name, amount=1):
+        host_metrics = self._metrics.setdefault(host, {
+            'requests': 0, 'throttled': 0, 'wait_seconds': 0.0, 'rate_limited': 0,
+            'failures': 0, 'circuit_opens': 0, 'rejected': 0
+        })
+        host_metrics[name] += amount
+
+    def metrics(self):
+        with self._lock:
+            return {host: dict(values) for host, values in self._metrics.items()}
+
+    def pause(self, host, seconds):
+        """Hold back requests to host for the given number of seconds"""
+        with self._lock:
+            self._pause(host, seconds)
+
+    def _pause(self, host, seconds):
+        if seconds > self.max_wait:
+            self._open_circuit(host, seconds)
+            return
+        until = time.monotonic() + seconds
+        self._paused_until[host] = max(self._paused_until.get(host, 0.0), until)
+
+    def _open_circuit(self, host, seconds=None):
+        self._circuit_open_until[host] = time.monotonic() + (seconds or self.cooldown)
+        self._metric(host, 'circuit_opens')
+
+    def acquire(self, host):
+        """Wait until a request to host is allowed; raise CircuitOpenError if it is blocked"""
+        with self._lock:
+            now = time.monotonic()
+            self._metric(host, 'requests')
+
+            if self._circuit_open_until.get(host, 0.0) > now:
+                self._metric(host, 'rejected')
+                raise CircuitOpenError(f"Circuit open for {host}; skipping request")
+
+            wait = max(0.0, self._paused_until.get(host, 0.0) - now)
+            if host in self.limits:
+                rate, burst = self.limits[host]
+                tokens, updated = self._buckets.get(host, (burst, now))
+                tokens = min(burst, tokens + (now - updated) * rate) - 1
+                self._buckets[host] = (tokens, now)
+                # A negative balance reserves a future slot for this caller
+                if tokens < 0:
+                    wait = max(wait, -tokens / rate)
+
+            if wait:
+                self._metric(host, 'throttled')
+                self._metric(host, 'wait_seconds', wait)
+
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def record_response(self, host, response):
+        """Adapt to the rate limit headers and status of a completed response"""
+        headers = response.headers
+        with self._lock:
+            if is_rate_limited(response):
+                self._metric(host, 'rate_limited')
+                self._record_failure(host)
+                retry_after = _retry_after_seconds(headers.get('Retry-After'))
+                if retry_after is None and headers.get('X-RateLimit-Reset'):
+                    retry_after = max(0.0, float(headers['X-RateLimit-Reset']) - time.time())
+                if retry_after is None:
+                    retry_after = self.base_backoff * 2 ** (self._failures[host] - 1)
+                self._pause(host, retry_after)
+                return
+
+            if response.status_code >= 500:
+                self._record_failure(host)
+                return
+
+            self._failures[host] = 0
+            if headers.get('X-RateLimit-Remaining') == '0' and headers.get('X-RateLimit-Reset'):
+                self._pause(host, max(0.0, float(headers['X-RateLimit-Reset']) - time.time()))
+
+    def record_failure(self, host):
+        """Count a connection-level failure against host's circuit"""
+        with self._lock:
+            self._record_failure(host)
+
+    def _record_failure(self, host):
+        self._metric(host, 'failures')
+        self._failures[host] = self._failures.get(host, 0) + 1
+        if self._failures[host] >= self.failure_threshold:
+            self._failures[host] = 0
+            self._open_circuit(host)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that consults the host's rate limiter around each request"""
+
+    def __init__(self, limiter, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).hostname
+        self.limiter.acquire(host)
+        try:
+            response = super().send(request, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            self.limiter.record_failure(host)
+            raise
+        self.limiter.record_response(host, response)
+        return response
+
+
+def create_session(pool_connections=10, pool_maxsize=20, retries=3, backoff_factor=0.5,
+                   user_agent=DEFAULT_USER_AGENT, limiter=None, rate_limited=True):
+    """Build a keep-alive session with a sized connection pool and retry policy
+
+    Unless rate_limited is false, requests go through limiter (by default a
+    RateLimiter for DEFAULT_HOST_LIMITS), available as session.rate_limiter.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        # Retry-After is handled by RateLimiter, which caps how long a request may stall
+        respect_retry_after_header=False,
+        raise_on_status=False
+    )
+    if not rate_limited:
+        limiter = None
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    else:
+        if limiter is None:
+            limiter = RateLimiter(DEFAULT_HOST_LIMITS)
+        adapter = RateLimitedAdapter(limiter, pool_connections=pool_connections,
+                                     pool_maxsize=pool_maxsize, max_retries=retry)
+
+    session = requests.Session()
+    session.rate_limiter = limiter
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': user_agent,
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+    return session
+
+
+def get_session():
+    """Return the process-wide rate-limited session for API calls, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def get_page_session():
+    """Return the process-wide session for fetching arbitrary pages, without per-host limits"""
+    global _page_session
+    if _page_session is None:
+        with _session_lock:
+            if _page_session is None:
+                _page_session = create_session(rate_limited=False)
+    return _page_session
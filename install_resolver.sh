@@ -9,14 +9,13 @@ source pandas_resolver_env/bin/activate
 
 # Install dependencies
 pip install --upgrade pip
-pip install requests beautifulsoup4 lxml
+pip install requests beautifulsoup4 lxml packaging
 
 # Make scripts executable
-chmod +x pandas_build_resolver.py
-chmod +x quick_pandas_fix.py
+chmod +x main_pandas.py
 
 echo "✅ Installation complete!"
 echo "🔧 Usage:"
-echo "   Comprehensive analysis: ./pandas_build_resolver.py --log-file your_log.txt"
-echo "   Quick fix: ./quick_pandas_fix.py"
+echo "   Comprehensive analysis: ./main_pandas.py --log-file your_log.txt"
+echo "   Nightly triage: ./main_pandas.py --batch 'build_logs/**/*.log' --output-dir reports"
 echo "   Virtual environment: source pandas_resolver_env/bin/activate"
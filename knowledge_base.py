@@ -0,0 +1,194 @@
+"""
+Knowledge base of past resolver outcomes.
+
+Every solution attempt is recorded with the environment it ran in, the
+findings of the build log that prompted it, whether it fixed the build and
+how long it took. Ranking orders solutions by expected time to a fix: a
+solution's success rate is estimated from past runs on the same environment
+or with overlapping log findings, shrunk towards its overall rate while
+there are few of them, and solutions are tried in increasing order of
+expected seconds per success.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+
+DEFAULT_KNOWLEDGE_BASE = 'resolver_knowledge.db'
+
+# Weight, in attempts, of a solution's overall record when estimating its
+# success rate on similar runs
+PRIOR_WEIGHT = 2
+
+# Assumed duration of a solution that has never been timed
+DEFAULT_EXPECTED_SECONDS = 60
+
+# Most frequent log findings used to recognize similar failures
+MAX_LOG_FINGERPRINTS = 20
+
+
+def environment_fingerprint(environment):
+    """Short stable hash of the parts of an environment that affect how a build goes
+
+    Patch releases of Python and the host kernel version are ignored so that
+    routine updates do not hide an environment's history.
+    """
+    def version(text):
+        match = re.search(r'\d+\.\d+', text or '')
+        return match.group(0) if match else None
+
+    compiler = environment.get('compiler')
+    fields = {
+        'python': version(environment.get('python_version')),
+        'platform': (environment.get('platform') or '').split('-')[0],
+        'machine': (environment.get('platform') or '').split('-')[-1],
+        'pip': version(environment.get('pip_version')),
+        'setuptools': version(environment.get('setuptools_version')),
+        'numpy': version(environment.get('numpy_version')),
+        'compiler': compiler.get('available') if isinstance(compiler, dict) else bool(compiler)
+    }
+    return hashlib.sha1(json.dumps(fields, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def log_fingerprints(log_analysis):
+    """Fingerprints identifying the failure in a log: its top findings and fatal error pattern"""
+    fingerprints = [finding['fingerprint'] for finding in log_analysis.get('findings', [])[:MAX_LOG_FINGERPRINTS]]
+    if log_analysis.get('fatal'):
+        fingerprints.append(f"fatal:{log_analysis['fatal']['pattern']}")
+    return fingerprints
+
+
+def solution_seconds(result):
+    """Time a solution attempt took, from its isolated timings or its commands
+
+    A command that timed out counts for its whole timeout, which is what
+    trying that solution again would cost.
+    """
+    if result.get('timings'):
+        return result['timings']['total_seconds']
+    return round(sum(output.get('seconds') or 0 for output in result['outputs']), 2)
+
+
+class OutcomeStore:
+    """SQLite record of solution outcomes with per-environment and per-failure statistics"""
+
+    def __init__(self, db_path=DEFAULT_KNOWLEDGE_BASE):
+        self.db_path = db_path
+        self._init_tables()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _init_tables(self):
+        conn = self._connect()
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS outcomes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                recorded_at REAL NOT NULL,
+                environment TEXT NOT NULL,
+                solution TEXT NOT NULL,
+                success INTEGER NOT NULL,
+                seconds REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS outcome_findings (
+                outcome_id INTEGER NOT NULL REFERENCES outcomes (id),
+                fingerprint TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_outcomes_solution ON outcomes (solution, environment);
+            CREATE INDEX IF NOT EXISTS idx_outcome_findings_fingerprint ON outcome_findings (fingerprint);
+        ''')
+        conn.commit()
+        conn.close()
+
+    def record(self, environment, fingerprints, results):
+        """Record a run's solution results; cancelled and never-run attempts are skipped
+
+        An attempt with a command that timed out is a failure, however the
+        solution was marked. Returns the number of outcomes recorded.
+        """
+        now = time.time()
+        conn = self._connect()
+        recorded = 0
+        with conn:
+            for result in results:
+                if result.get('cancelled') or not result['outputs']:
+                    continue
+                timed_out = any(output.get('timed_out') for output in result['outputs'])
+                cursor = conn.execute(
+                    'INSERT INTO outcomes (recorded_at, environment, solution, success, seconds) VALUES (?, ?, ?, ?, ?)',
+                    (now, environment, result['solution'], int(result['success'] and not timed_out),
+                     solution_seconds(result))
+                )
+                conn.executemany('INSERT INTO outcome_findings (outcome_id, fingerprint) VALUES (?, ?)',
+                                 [(cursor.lastrowid, fingerprint) for fingerprint in set(fingerprints)])
+                recorded += 1
+        conn.close()
+        return recorded
+
+    def statistics(self, environment=None, fingerprints=()):
+        """Per-solution totals, overall and over similar runs
+
+        Similar runs are those on the same environment or sharing at least one
+        log fingerprint. Returns {solution: {'attempts', 'successes',
+        'seconds', 'similar_attempts', 'similar_successes', 'similar_seconds'}}
+        with total durations in seconds.
+        """
+        fingerprints = list(set(fingerprints))
+        placeholders = ', '.join('?' * len(fingerprints))
+        similar = 'environment = ?'
+        if fingerprints:
+            similar += (f' OR id IN (SELECT outcome_id FROM outcome_findings'
+                        f' WHERE fingerprint IN ({placeholders}))')
+
+        conn = self._connect()
+        rows = conn.execute(f'''
+            SELECT solution, COUNT(*), SUM(success), SUM(seconds),
+                   SUM(similar), SUM(similar * success), SUM(similar * seconds)
+            FROM (SELECT solution, success, seconds, COALESCE(({similar}), 0) AS similar FROM outcomes)
+            GROUP BY solution
+        ''', [environment] + fingerprints).fetchall()
+        conn.close()
+
+        return {
+            solution: {
+                'attempts': attempts, 'successes': successes, 'seconds': seconds,
+                'similar_attempts': similar_attempts, 'similar_successes': similar_successes,
+                'similar_seconds': similar_seconds
+            }
+            for solution, attempts, successes, seconds, similar_attempts, similar_successes, similar_seconds in rows
+        }
+
+    def rank(self, solutions, environment=None, fingerprints=()):
+        """Solutions ordered by expected seconds per success, each with a 'history' estimate added
+
+        A solution that has never been tried is assumed to work half the time
+        in DEFAULT_EXPECTED_SECONDS; ties keep the original order.
+        """
+        statistics = self.statistics(environment, fingerprints)
+        ranked = []
+        for position, solution in enumerate(solutions):
+            stats = statistics.get(solution['title'])
+            if stats is None:
+                history = {'attempts': 0, 'successes': 0, 'similar_attempts': 0, 'similar_successes': 0,
+                           'success_rate': 0.5, 'expected_seconds': DEFAULT_EXPECTED_SECONDS}
+            else:
+                overall_rate = (stats['successes'] + 1) / (stats['attempts'] + 2)
+                success_rate = ((stats['similar_successes'] + PRIOR_WEIGHT * overall_rate)
+                                / (stats['similar_attempts'] + PRIOR_WEIGHT))
+                if stats['similar_attempts']:
+                    expected_seconds = stats['similar_seconds'] / stats['similar_attempts']
+                else:
+                    expected_seconds = stats['seconds'] / stats['attempts']
+                history = {
+                    'attempts': stats['attempts'], 'successes': stats['successes'],
+                    'similar_attempts': stats['similar_attempts'], 'similar_successes': stats['similar_successes'],
+                    'success_rate': round(success_rate, 3), 'expected_seconds': round(expected_seconds, 1)
+                }
+            # Trying solutions in increasing order of time per success minimizes the expected time to a fix
+            cost = max(history['expected_seconds'], 1) / history['success_rate']
+            ranked.append((cost, position, {**solution, 'history': history}))
+        return [solution for _, _, solution in sorted(ranked, key=lambda item: item[:2])]
@@ -0,0 +1,721 @@
+"""
+Build log analysis for the pandas build resolver.
+
+LogScanner compiles the resolver's issue patterns once and counts them over a
+case-folded copy of the log. Case-sensitive literal prefixes let the regex
+engine skip ahead with a fast substring search, which IGNORECASE patterns
+cannot do; folding costs one cheap str.lower() and is only used for ASCII
+text, where it is exactly equivalent to re.IGNORECASE.
+
+StreamingLogAnalyzer applies the same scanner to newline-aligned chunks read
+from a file, stdin or a gzip'd log, so memory stays bounded by the chunk size
+no matter how large the log is. No pattern can match across a newline, so
+chunked counts are identical to whole-log counts. For the same reason a large
+uncompressed log can be split into newline-aligned byte ranges, analyzed in a
+process pool and merged in file order with the same result as one pass.
+
+Matching lines in the error and warning categories are also grouped into
+findings: each line is reduced to a fingerprint with paths, hex addresses and
+numbers normalized away, so thousands of repeats of the same warning become a
+single finding with a count, its first line number and surrounding context.
+
+log_environment recovers what a log reveals about the machine that built it
+(Python version, platform, build tool versions), for logs analyzed away from
+that machine.
+
+watch_log follows a log while pip is still writing it, updating the analysis
+as lines arrive and reporting the first known fatal error as soon as it is
+written, so a doomed build can be stopped early.
+"""
+
+import gzip
+import hashlib
+import io
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Pattern matching for different issue types
+LOG_PATTERNS = {
+    'numpy_headers': r"dependency.*numpy.*won't be automatically included",
+    'package_config': r"Package.*is absent from the.*packages.*configuration",
+    'compilation_error': r"error:|Error:|ERROR:",
+    'warning_messages': r"warning:|Warning:|WARNING:",
+    'python_version': r"python3\.(\d+)",
+    'build_success': r"Successfully installed|Running setup\.py install for",
+    'missing_dependencies': r"ModuleNotFoundError|ImportError"
+}
+
+# Categories whose matching lines are kept as samples in streamed analyses
+SAMPLE_CATEGORIES = ('numpy_headers', 'package_config', 'compilation_error', 'missing_dependencies')
+
+# Categories whose matching lines are grouped into fingerprinted findings
+FINDING_CATEGORIES = ('numpy_headers', 'package_config', 'compilation_error', 'warning_messages',
+                      'missing_dependencies')
+
+# Lines after which a pip build cannot succeed; watch_log reports the first one
+FATAL_PATTERNS = {
+    'command_failed': r"error: command '[^']*' failed with exit (?:status|code) \d+",
+    'subprocess_exited': r"error: subprocess-exited-with-error",
+    'metadata_failed': r"error: metadata-generation-failed",
+    'wheel_build_failed': r"ERROR: Failed building wheel for",
+    'no_matching_distribution': r"ERROR: No matching distribution found for",
+    'resolution_impossible': r"ResolutionImpossible",
+}
+
+# Traces of the build environment in a pip log: the CPython version in build
+# directories and wheel tags, the platform in build directories and wheel
+# platform tags, and the versions of the build tools pip downloaded or installed
+ENVIRONMENT_PATTERNS = {
+    'python_version': re.compile(r'cpython-3(\d+)|\bcp3(\d+)-|\bpython3\.(\d+)', re.IGNORECASE),
+    'platform': re.compile(
+        r'\bbuild[/\\](?:lib|temp)\.(linux|macosx-[\d.]+|win)-(\w+?)-'
+        r'|-(manylinux\w*?|musllinux_\d+_\d+|macosx_\d+_\d+|win)_(x86_64|aarch64|arm64|amd64|i686|universal2)\b'
+    ),
+    'tool_version': re.compile(r'\b(pip|setuptools|numpy|cython)-(\d+(?:\.\d+)+)\b', re.IGNORECASE),
+}
+
+# Operating system names as platform.platform() reports them
+_PLATFORM_SYSTEMS = (('linux', 'Linux'), ('manylinux', 'Linux'), ('musllinux', 'Linux'),
+                     ('macosx', 'macOS'), ('win', 'Windows'))
+
+# Finding categories that identify what broke a build; warnings vary too much between runs
+SIGNATURE_CATEGORIES = ('numpy_headers', 'package_config', 'compilation_error', 'missing_dependencies')
+
+CHUNK_SIZE = 4 * 1024 * 1024
+POLL_INTERVAL = 0.5
+MAX_SAMPLE_CHARS = 300
+MAX_FINDINGS_PER_CATEGORY = 100
+CONTEXT_LINES = 2
+
+# Applied in order: paths before numbers so versioned directories collapse to one token
+_FINGERPRINT_SUBSTITUTIONS = (
+    (re.compile(r'(?:[A-Za-z]:)?[\w.+~-]*(?:[\\/][\w.+~-]+)+[\\/]?'), '<path>'),
+    (re.compile(r'0x[0-9a-fA-F]+'), '<hex>'),
+    (re.compile(r'\d+'), '<n>'),
+    (re.compile(r'\s+'), ' '),
+)
+# Numbers never survive normalization, so zeroing them first lets lines that
+# differ only in numbers share one cached fingerprint
+_ZERO_DIGITS = str.maketrans('123456789', '000000000')
+
+
+# Escapes whose meaning changes when lower-cased, such as \S, \W or \Z
+_UPPERCASE_ESCAPE = re.compile(r'\\[A-Z]')
+
+
+def _fold_pattern(pattern):
+    """A regex for case-folded text that matches as pattern does with re.IGNORECASE
+
+    The pattern's literals are lower-cased and alternatives that become
+    duplicates dropped. A pattern with an uppercase escape is compiled with
+    IGNORECASE instead, since lower-casing it would change what it matches.
+    """
+    if _UPPERCASE_ESCAPE.search(pattern):
+        return re.compile(pattern, re.IGNORECASE)
+    folded = pattern.lower()
+    if '(' not in folded and '[' not in folded:
+        folded = '|'.join(dict.fromkeys(folded.split('|')))
+    return re.compile(folded)
+
+
+class LogScanner:
+    """Precompiled, case-folding counter for build log issue patterns"""
+
+    def __init__(self, patterns=LOG_PATTERNS):
+        self.patterns = dict(patterns)
+        self.compiled = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in self.patterns.items()}
+        self.folded = {name: _fold_pattern(pattern) for name, pattern in self.patterns.items()}
+
+    def searchable(self, text):
+        """The text to search and the patterns to search it with: case-folded for ASCII text"""
+        if text.isascii():
+            return text.lower(), self.folded
+        return text, self.compiled
+
+    def scan(self, text):
+        """Count matches per category, exactly as re.findall(pattern, text, re.IGNORECASE) would"""
+        text, patterns = self.searchable(text)
+        return {name: len(pattern.findall(text)) for name, pattern in patterns.items()}
+
+
+def build_analysis(statistics):
+    """Turn per-category match counts into the resolver's analysis dict"""
+    analysis = {
+        'critical_issues': [],
+        'warnings': [],
+        'suggestions': [],
+        'statistics': dict(statistics)
+    }
+
+    if statistics.get('numpy_headers'):
+        analysis['critical_issues'].append(f"NumPy header path issues: {statistics['numpy_headers']} warnings")
+    if statistics.get('package_config'):
+        analysis['warnings'].append(f"Package configuration issues: {statistics['package_config']} warnings")
+    if statistics.get('compilation_error'):
+        analysis['critical_issues'].append(f"Compilation errors: {statistics['compilation_error']} found")
+    if statistics.get('build_success'):
+        analysis['suggestions'].append("Build completed (with warnings)")
+
+    # Additional analysis
+    if statistics.get('numpy_headers', 0) > 50:
+        analysis['critical_issues'].append("High volume of NumPy header warnings - potential path configuration issue")
+
+    return analysis
+
+
+def normalize_line(line):
+    """Reduce a log line to its message shape by replacing paths and numbers with placeholders"""
+    line = line.strip().translate(_ZERO_DIGITS)
+    for pattern, replacement in _FINGERPRINT_SUBSTITUTIONS:
+        line = pattern.sub(replacement, line)
+    return line
+
+
+def fingerprint(category, normalized):
+    """Short stable identifier for a normalized line within a category"""
+    return hashlib.sha1(f"{category}\0{normalized}".encode('utf-8')).hexdigest()[:12]
+
+
+def log_signature(analysis):
+    """Short stable identifier for the failure an analyzed log shows, or None for a log with no findings
+
+    Logs of the same broken build share a signature: it is made from the
+    first fatal error and the distinct error findings, all normalized.
+    """
+    parts = sorted({finding['fingerprint'] for finding in analysis.get('findings', [])
+                    if finding['category'] in SIGNATURE_CATEGORIES})
+    if analysis.get('fatal'):
+        parts.insert(0, fingerprint(analysis['fatal']['pattern'], normalize_line(analysis['fatal']['text'])))
+    if not parts:
+        return None
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()[:12]
+
+
+def _lines_before(text, line_start, count):
+    """Up to count lines of text ending just before the line that starts at line_start"""
+    lines = []
+    end = line_start - 1
+    while len(lines) < count and end >= 0:
+        start = text.rfind('\n', 0, end) + 1
+        lines.append(text[start:end])
+        end = start - 1
+    return lines[::-1]
+
+
+def _lines_after(text, line_end, count):
+    """Up to count lines of text following the line that ends at line_end"""
+    lines = []
+    start = line_end + 1
+    while len(lines) < count and start < len(text):
+        end = text.find('\n', start)
+        if end == -1:
+            end = len(text)
+        lines.append(text[start:end])
+        start = end + 1
+    return lines
+
+
+def _context_line(line):
+    return line.rstrip()[:MAX_SAMPLE_CHARS]
+
+
+def analyze_text(log_content, scanner=None):
+    """Analyze a complete log held in memory"""
+    analyzer = StreamingLogAnalyzer(scanner)
+    analyzer.feed(log_content)
+    return analyzer.result()
+
+
+def _is_gzip(path):
+    with open(path, 'rb') as f:
+        return f.read(2) == b'\x1f\x8b'
+
+
+def open_log(source):
+    """Open a log for text reading: '-' for stdin, gzip'd files by their magic bytes"""
+    if source == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+
+    if _is_gzip(source):
+        return gzip.open(source, 'rt', encoding='utf-8', errors='replace')
+    return open(source, 'r', encoding='utf-8', errors='replace')
+
+
+def iter_line_chunks(fileobj, chunk_size=CHUNK_SIZE):
+    """Yield chunks of roughly chunk_size characters that end on a line boundary"""
+    remainder = ''
+    while True:
+        block = fileobj.read(chunk_size)
+        if not block:
+            if remainder:
+                yield remainder
+            return
+
+        block = remainder + block
+        cut = block.rfind('\n') + 1
+        if cut == 0:
+            # A single line longer than the chunk size; keep reading until it ends
+            remainder = block
+            continue
+        remainder = block[cut:]
+        yield block[:cut]
+
+
+class StreamingLogAnalyzer:
+    """Incremental deep_log_analysis over a log fed chunk by chunk.
+
+    Keeps running per-category counts plus, for the critical categories, up
+    to max_samples matching lines with their 1-based line numbers. Matching
+    lines in finding_categories are grouped by fingerprint into at most
+    max_findings findings per category; lines whose fingerprint arrives after
+    that are only counted in findings_overflow.
+    """
+
+    def __init__(self, scanner=None, max_samples=20, sample_categories=SAMPLE_CATEGORIES,
+                 finding_categories=FINDING_CATEGORIES, max_findings=MAX_FINDINGS_PER_CATEGORY,
+                 context_lines=CONTEXT_LINES):
+        self.scanner = scanner or LogScanner()
+        self.max_samples = max_samples
+        self.max_findings = max_findings
+        self.context_lines = context_lines
+        self.statistics = dict.fromkeys(self.scanner.patterns, 0)
+        self.samples = {name: [] for name in sample_categories if name in self.scanner.patterns}
+        self.finding_categories = [name for name in finding_categories if name in self.scanner.patterns]
+        self.findings = {}
+        self.findings_per_category = dict.fromkeys(self.finding_categories, 0)
+        self.findings_overflow = dict.fromkeys(self.finding_categories, 0)
+        self.lines = 0
+        self._partial_line = False
+        self._normalized = {}
+        self._tail = []
+        self._pending_context = []
+
+    def feed(self, chunk):
+        """Analyze a chunk that starts at a line boundary"""
+        if self._pending_context:
+            self.extend_context(chunk)
+
+        text, patterns = self.scanner.searchable(chunk)
+        for name, pattern in patterns.items():
+            samples = self.samples.get(name)
+            if samples is not None and len(samples) >= self.max_samples:
+                samples = None
+            wants_findings = name in self.finding_categories
+            if samples is None and not wants_findings:
+                self.statistics[name] += len(pattern.findall(text))
+            else:
+                # Folding keeps offsets, so match positions index the original chunk
+                self.statistics[name] += self._collect(chunk, pattern.finditer(text), name, samples, wants_findings)
+
+        if self.context_lines:
+            self._tail = (self._tail + _lines_before(chunk, len(chunk), self.context_lines))[-self.context_lines:]
+        self.lines += chunk.count('\n')
+        self._partial_line = not chunk.endswith('\n')
+
+    def _collect(self, chunk, matches, name, samples, wants_findings):
+        """Count one category's matches, recording a sample and finding once per matching line"""
+        count = 0
+        line_index = 0
+        position = 0
+        line_end = -1
+        for match in matches:
+            count += 1
+            offset = match.start()
+            if offset <= line_end:
+                continue
+            line_start = chunk.rfind('\n', 0, offset) + 1
+            line_end = chunk.find('\n', offset)
+            if line_end == -1:
+                line_end = len(chunk)
+            line = chunk[line_start:line_end]
+
+            key = normalized = None
+            if wants_findings:
+                key, normalized = self._fingerprint(name, line)
+                finding = self.findings.get(key)
+                if finding is not None:
+                    # Repeats only need a count, so skip working out their line number
+                    finding['count'] += 1
+                    key = None
+                elif self.findings_per_category[name] >= self.max_findings:
+                    self.findings_overflow[name] += 1
+                    key = None
+            wants_sample = samples is not None and len(samples) < self.max_samples
+            if key is None and not wants_sample:
+                continue
+
+            line_index += chunk.count('\n', position, line_start)
+            position = line_start
+            if wants_sample:
+                samples.append({'line': self.lines + line_index + 1, 'text': line.strip()[:MAX_SAMPLE_CHARS]})
+            if key is not None:
+                self._add_finding(chunk, name, key, normalized, line, line_index, line_start, line_end)
+        return count
+
+    def _fingerprint(self, name, line):
+        cache_key = (name, line.translate(_ZERO_DIGITS))
+        cached = self._normalized.get(cache_key)
+        if cached is None:
+            if len(self._normalized) >= 10000:
+                self._normalized.clear()
+            normalized = normalize_line(cache_key[1])
+            cached = self._normalized[cache_key] = (fingerprint(name, normalized), normalized)
+        return cached
+
+    def _add_finding(self, chunk, name, key, normalized, line, line_index, line_start, line_end):
+        before = _lines_before(chunk, line_start, self.context_lines)
+        if len(before) < self.context_lines and line_index == len(before):
+            # The match is near the top of the chunk; the rest comes from the previous one
+            before = self._tail[-(self.context_lines - len(before)):] + before
+        after = _lines_after(chunk, line_end, self.context_lines)
+
+        self.findings_per_category[name] += 1
+        finding = self.findings[key] = {
+            'fingerprint': key,
+            'category': name,
+            'message': normalized[:MAX_SAMPLE_CHARS],
+            'count': 1,
+            'first_line': self.lines + line_index + 1,
+            'example': line.strip()[:MAX_SAMPLE_CHARS],
+            'context': {
+                'before': [_context_line(text) for text in before],
+                'after': [_context_line(text) for text in after]
+            }
+        }
+        if len(after) < self.context_lines:
+            self._pending_context.append(finding)
+
+    def extend_context(self, text):
+        """Complete the trailing context of findings at the end of the previous chunk"""
+        still_pending = []
+        for finding in self._pending_context:
+            after = finding['context']['after']
+            needed = self.context_lines - len(after)
+            after.extend(_context_line(line) for line in _lines_after(text, -1, needed))
+            if len(after) < self.context_lines:
+                still_pending.append(finding)
+        self._pending_context = still_pending
+
+    def result(self):
+        """The analysis dict for everything fed so far, with samples, findings and line count"""
+        analysis = build_analysis(self.statistics)
+        analysis['samples'] = {name: list(samples) for name, samples in self.samples.items()}
+        analysis['findings'] = sort_findings(self.findings.values())
+        analysis['findings_overflow'] = dict(self.findings_overflow)
+        analysis['lines'] = self.lines + (1 if self._partial_line else 0)
+        return analysis
+
+
+def sort_findings(findings):
+    """Most frequent findings first, ties broken by where they first appeared"""
+    return sorted(findings, key=lambda finding: (-finding['count'], finding['first_line'], finding['category']))
+
+
+def shard_ranges(path, shards):
+    """Split a file into up to `shards` (start, end) byte ranges that begin on line starts"""
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, shards):
+            target = max(size * i // shards, boundaries[-1])
+            f.seek(target)
+            if target:
+                f.readline()  # move to the start of the next line
+            boundaries.append(min(f.tell(), size))
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+def iter_byte_range_chunks(path, start, end, chunk_size=CHUNK_SIZE):
+    """Yield decoded, line-aligned text chunks from bytes [start, end) of a file"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        remainder = b''
+        while remaining > 0:
+            block = f.read(min(chunk_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            block = remainder + block
+            # Cut on a newline byte so multi-byte UTF-8 sequences are never split
+            cut = block.rfind(b'\n') + 1
+            if cut == 0:
+                remainder = block
+                continue
+            remainder = block[cut:]
+            yield block[:cut].decode('utf-8', errors='replace')
+        if remainder:
+            yield remainder.decode('utf-8', errors='replace')
+
+
+def _read_context_around(path, start, end, lines):
+    """The lines just before byte offset start and just after byte offset end"""
+    with open(path, 'rb') as f:
+        before = []
+        if start:
+            f.seek(max(0, start - 64 * 1024))
+            head = f.read(start - f.tell()).decode('utf-8', errors='replace')
+            before = _lines_before(head, len(head), lines)
+        f.seek(end)
+        after = b''.join(f.readline() for _ in range(lines)).decode('utf-8', errors='replace')
+    return before, after
+
+
+def _analyze_shard(path, start, end, chunk_size, max_samples, patterns, fatal_patterns=None):
+    analyzer = StreamingLogAnalyzer(LogScanner(patterns), max_samples=max_samples)
+    fatal_pattern = compile_fatal_patterns(fatal_patterns) if fatal_patterns else None
+    fatal = None
+    # Give findings at the shard edges the same context a single pass would see
+    before, after = _read_context_around(path, start, end, analyzer.context_lines)
+    analyzer._tail = before
+    for chunk in iter_byte_range_chunks(path, start, end, chunk_size):
+        if fatal_pattern and fatal is None:
+            fatal = find_fatal(fatal_pattern, chunk, analyzer.lines + 1)
+        analyzer.feed(chunk)
+    if analyzer._pending_context and after:
+        analyzer.extend_context(after)
+    return {
+        'statistics': analyzer.statistics,
+        'samples': analyzer.samples,
+        'findings': analyzer.findings,
+        'findings_overflow': analyzer.findings_overflow,
+        'lines': analyzer.lines,
+        'partial': analyzer._partial_line,
+        'fatal': fatal
+    }
+
+
+def merge_shard_results(shard_results, max_samples=20, patterns=LOG_PATTERNS,
+                        max_findings=MAX_FINDINGS_PER_CATEGORY, fatal_patterns=None):
+    """Combine per-shard results in file order.
+
+    With fatal_patterns, the first fatal line of the earliest shard that has
+    one is reported under 'fatal'. Findings are merged by fingerprint. Once a category has max_findings
+    distinct fingerprints the rest are counted in findings_overflow, as in a
+    single pass, except that repeats of an admitted fingerprint that a shard
+    had itself overflowed stay in the overflow count.
+    """
+    statistics = dict.fromkeys(patterns, 0)
+    samples = {name: [] for name in SAMPLE_CATEGORIES if name in patterns}
+    findings = {}
+    per_category = {}
+    overflow = {name: 0 for name in FINDING_CATEGORIES if name in patterns}
+    lines = 0
+    partial = False
+    fatal = None
+    for shard in shard_results:
+        if fatal is None and shard.get('fatal'):
+            fatal = dict(shard['fatal'], line=shard['fatal']['line'] + lines)
+        for name, count in shard['statistics'].items():
+            statistics[name] += count
+        for name, entries in shard['samples'].items():
+            merged = samples.setdefault(name, [])
+            # Shard line numbers are relative to the shard; shift them to file positions
+            merged.extend({'line': entry['line'] + lines, 'text': entry['text']}
+                          for entry in entries[:max_samples - len(merged)])
+        for key, finding in shard['findings'].items():
+            if key in findings:
+                findings[key]['count'] += finding['count']
+            elif per_category.get(finding['category'], 0) < max_findings:
+                per_category[finding['category']] = per_category.get(finding['category'], 0) + 1
+                findings[key] = dict(finding, first_line=finding['first_line'] + lines)
+            else:
+                overflow[finding['category']] = overflow.get(finding['category'], 0) + finding['count']
+        for name, count in shard['findings_overflow'].items():
+            overflow[name] = overflow.get(name, 0) + count
+        lines += shard['lines']
+        partial = shard['partial']
+
+    analysis = build_analysis(statistics)
+    analysis['samples'] = samples
+    analysis['findings'] = sort_findings(findings.values())
+    analysis['findings_overflow'] = overflow
+    analysis['lines'] = lines + (1 if partial else 0)
+    if fatal_patterns:
+        analysis['fatal'] = fatal
+    return analysis
+
+
+def analyze_file_parallel(path, workers, chunk_size=CHUNK_SIZE, patterns=LOG_PATTERNS, max_samples=20,
+                          fatal_patterns=None):
+    """Analyze an uncompressed log in a process pool of `workers` shards"""
+    ranges = shard_ranges(path, workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_analyze_shard, path, start, end, chunk_size, max_samples, patterns,
+                                   fatal_patterns)
+                   for start, end in ranges]
+        return merge_shard_results([future.result() for future in futures], max_samples, patterns,
+                                   fatal_patterns=fatal_patterns)
+
+
+def analyze_file(source, chunk_size=CHUNK_SIZE, scanner=None, max_samples=20, workers=1,
+                 fatal_patterns=None):
+    """Stream-analyze a log file path, '-' for stdin, or a gzip'd log
+
+    With workers > 1 an uncompressed file is sharded across processes;
+    stdin and gzip'd logs cannot be split and are always read sequentially.
+    Given fatal_patterns, the analysis also reports the first fatal line
+    under 'fatal', as watch_log does.
+    """
+    if workers > 1 and source != '-' and not _is_gzip(source):
+        patterns = scanner.patterns if scanner else LOG_PATTERNS
+        return analyze_file_parallel(source, workers, chunk_size, patterns, max_samples, fatal_patterns)
+
+    analyzer = StreamingLogAnalyzer(scanner, max_samples=max_samples)
+    fatal_pattern = compile_fatal_patterns(fatal_patterns) if fatal_patterns else None
+    fatal = None
+    with open_log(source) as log:
+        for chunk in iter_line_chunks(log, chunk_size):
+            if fatal_pattern and fatal is None:
+                fatal = find_fatal(fatal_pattern, chunk, analyzer.lines + 1)
+            analyzer.feed(chunk)
+    analysis = analyzer.result()
+    if fatal_pattern:
+        analysis['fatal'] = fatal
+    return analysis
+
+
+def log_environment(source, chunk_size=CHUNK_SIZE):
+    """The build environment a log shows, in the resolver's environment fields
+
+    Returns whichever of python_version ('3.11'), platform ('Linux-x86_64')
+    and pip, setuptools, numpy and cython versions the log reveals, taking
+    the last mention of each; fields the log never mentions are left out.
+    """
+    environment = {}
+    with open_log(source) as log:
+        for chunk in iter_line_chunks(log, chunk_size):
+            for match in ENVIRONMENT_PATTERNS['python_version'].finditer(chunk):
+                environment['python_version'] = f"3.{next(group for group in match.groups() if group)}"
+            for match in ENVIRONMENT_PATTERNS['platform'].finditer(chunk):
+                system, machine = match.group(1, 2) if match.group(1) else match.group(3, 4)
+                name = next(name for prefix, name in _PLATFORM_SYSTEMS if system.lower().startswith(prefix))
+                environment['platform'] = f"{name}-{machine}"
+            for match in ENVIRONMENT_PATTERNS['tool_version'].finditer(chunk):
+                environment[f"{match.group(1).lower()}_version"] = match.group(2)
+    return environment
+
+
+def follow_log(path, poll_interval=POLL_INTERVAL, idle_timeout=None, stop=None):
+    """Yield newline-terminated text as it is appended to a log, like tail -F.
+
+    Reading starts at the beginning of the file, waiting for it to be
+    created. Following ends once stop() returns true or nothing has been
+    written for idle_timeout seconds; whatever is left, including an
+    unterminated last line, is yielded before returning. A log that is
+    replaced (new inode) or truncated is read again from its start, after
+    the old file's unterminated last line is yielded as a line of its own.
+    """
+    log = None
+    remainder = b''
+    last_activity = time.monotonic()
+    try:
+        while True:
+            if log is None:
+                try:
+                    log = open(path, 'rb')
+                except FileNotFoundError:
+                    pass
+
+            if log is not None:
+                block = log.read(CHUNK_SIZE)
+                if block:
+                    last_activity = time.monotonic()
+                    block = remainder + block
+                    cut = block.rfind(b'\n') + 1
+                    remainder = block[cut:]
+                    if cut:
+                        yield block[:cut].decode('utf-8', errors='replace')
+                    continue
+
+                try:
+                    current = os.stat(path)
+                except FileNotFoundError:
+                    current = None
+                replaced = current is None or current.st_ino != os.fstat(log.fileno()).st_ino
+                if replaced or current.st_size < log.tell():
+                    if remainder:
+                        yield remainder.decode('utf-8', errors='replace') + '\n'
+                        remainder = b''
+                    if replaced:
+                        log.close()
+                        log = None
+                    else:
+                        log.seek(0)
+                    continue
+
+            if stop is not None and stop():
+                break
+            if idle_timeout is not None and time.monotonic() - last_activity >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+
+        if log is not None:
+            remainder += log.read()
+        if remainder:
+            yield remainder.decode('utf-8', errors='replace')
+    finally:
+        if log is not None:
+            log.close()
+
+
+def compile_fatal_patterns(fatal_patterns=FATAL_PATTERNS):
+    """One regex for all fatal patterns, with each pattern as a named group"""
+    return re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in fatal_patterns.items()))
+
+
+def find_fatal(fatal_pattern, chunk, first_line=1):
+    """The first fatal line in a chunk as {'pattern', 'line', 'text'}, or None
+
+    first_line is the line number of the chunk's first line.
+    """
+    match = fatal_pattern.search(chunk)
+    if not match:
+        return None
+    line_start = chunk.rfind('\n', 0, match.start()) + 1
+    line_end = chunk.find('\n', match.start())
+    return {
+        'pattern': match.lastgroup,
+        'line': first_line + chunk.count('\n', 0, line_start),
+        'text': chunk[line_start:line_end if line_end != -1 else len(chunk)].strip()[:MAX_SAMPLE_CHARS]
+    }
+
+
+def watch_log(path, on_update=None, on_fatal=None, update_interval=2.0, scanner=None,
+              fatal_patterns=FATAL_PATTERNS, **follow_options):
+    """Analyze a log while it is being written.
+
+    on_update(analysis) is called at most every update_interval seconds with
+    the analysis so far. When a line matching fatal_patterns first appears,
+    on_fatal({'pattern', 'line', 'text'}) is called; watching stops there if
+    it returns true. follow_options are passed on to follow_log. Returns the
+    final analysis with a 'fatal' entry (None if no fatal line was seen).
+    """
+    analyzer = StreamingLogAnalyzer(scanner)
+    fatal_pattern = compile_fatal_patterns(fatal_patterns)
+    fatal = None
+    last_update = time.monotonic()
+
+    for chunk in follow_log(path, **follow_options):
+        lines_before = analyzer.lines
+        analyzer.feed(chunk)
+
+        stop = False
+        if fatal is None:
+            fatal = find_fatal(fatal_pattern, chunk, lines_before + 1)
+            if fatal:
+                stop = bool(on_fatal and on_fatal(fatal))
+
+        if on_update and (stop or time.monotonic() - last_update >= update_interval):
+            last_update = time.monotonic()
+            on_update(analyzer.result())
+        if stop:
+            break
+
+    analysis = analyzer.result()
+    analysis['fatal'] = fatal
+    return analysis
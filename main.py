@@ -3,15 +3,14 @@ import pandas as pd
 import datetime
 import json
 from datetime import datetime, timedelta
-import hashlib
-import sqlite3
 from pathlib import Path
-import requests
-from bs4 import BeautifulSoup
 import re
 import time
 import io
 import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from urllib.parse import urlparse
 
 # New imports for enhanced features
 from docx import Document
@@ -21,388 +20,99 @@ from duckduckgo_search import DDGS
 #import google.generativeai as genai
 import os
 
-# Initialize database with enhanced tables
-def init_db():
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    # Users table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            name TEXT NOT NULL,
-            role TEXT DEFAULT 'user',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Enhanced Problems table (now tickets)
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS problems (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            ticket_id TEXT UNIQUE NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT NOT NULL,
-            category TEXT NOT NULL,
-            priority TEXT NOT NULL,
-            status TEXT DEFAULT 'submitted',
-            submitted_by INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            deadline TIMESTAMP,
-            assigned_to INTEGER,
-            resolution TEXT,
-            resolved_at TIMESTAMP,
-            FOREIGN KEY (submitted_by) REFERENCES users (id),
-            FOREIGN KEY (assigned_to) REFERENCES users (id)
-        )
-    ''')
-    
-    # Assignments table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS assignments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            problem_id INTEGER,
-            user_id INTEGER,
-            assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            status TEXT DEFAULT 'assigned',
-            FOREIGN KEY (problem_id) REFERENCES problems (id),
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    
-    # Calendar events table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS calendar_events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            problem_id INTEGER,
-            title TEXT NOT NULL,
-            description TEXT,
-            event_date TIMESTAMP NOT NULL,
-            created_by INTEGER,
-            FOREIGN KEY (problem_id) REFERENCES problems (id),
-            FOREIGN KEY (created_by) REFERENCES users (id)
-        )
-    ''')
-    
-    # File attachments table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS file_attachments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            problem_id INTEGER,
-            filename TEXT NOT NULL,
-            file_data BLOB NOT NULL,
-            file_type TEXT NOT NULL,
-            uploaded_by INTEGER,
-            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (problem_id) REFERENCES problems (id),
-            FOREIGN KEY (uploaded_by) REFERENCES users (id)
-        )
-    ''')
-    
-    # Search results table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS search_results (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            problem_id INTEGER,
-            search_query TEXT NOT NULL,
-            result_title TEXT,
-            result_url TEXT,
-            result_snippet TEXT,
-            search_engine TEXT,
-            searched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (problem_id) REFERENCES problems (id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-
-# Generate unique ticket ID
-def generate_ticket_id():
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    import random
-    random_str = ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=4))
-    return f"TKT-{timestamp}-{random_str}"
-
-# Hash password
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
-
-# User authentication
-def authenticate_user(email, password):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    hashed_password = hash_password(password)
-    
-    c.execute('SELECT * FROM users WHERE email = ? AND password = ?', 
-              (email, hashed_password))
-    user = c.fetchone()
-    conn.close()
-    
-    if user:
-        return {
-            'id': user[0],
-            'email': user[1],
-            'name': user[3],
-            'role': user[4]
-        }
-    return None
-
-# Register new user
-def register_user(email, password, name, role='user'):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    hashed_password = hash_password(password)
-    
-    try:
-        c.execute('INSERT INTO users (email, password, name, role) VALUES (?, ?, ?, ?)',
-                  (email, hashed_password, name, role))
-        conn.commit()
-        conn.close()
-        return True
-    except sqlite3.IntegrityError:
-        conn.close()
-        return False
-
-# Enhanced problem submission with ticket ID
-def submit_problem(title, description, category, priority, submitted_by, deadline_days=30):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    deadline = datetime.now() + timedelta(days=deadline_days)
-    ticket_id = generate_ticket_id()
-    
-    c.execute('''
-        INSERT INTO problems (ticket_id, title, description, category, priority, submitted_by, deadline)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (ticket_id, title, description, category, priority, submitted_by, deadline))
-    
-    problem_id = c.lastrowid
-    conn.commit()
-    conn.close()
-    return problem_id, ticket_id
-
-# Get all problems
-def get_all_problems():
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    c.execute('''
-        SELECT p.*, u.name as submitted_by_name, u2.name as assigned_to_name
-        FROM problems p 
-        LEFT JOIN users u ON p.submitted_by = u.id 
-        LEFT JOIN users u2 ON p.assigned_to = u2.id
-        ORDER BY p.created_at DESC
-    ''')
-    problems = c.fetchall()
-    conn.close()
-    
-    return problems
-
-# Get user's submitted problems
-def get_user_problems(user_id):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    c.execute('''
-        SELECT p.*, u.name as submitted_by_name, u2.name as assigned_to_name
-        FROM problems p 
-        LEFT JOIN users u ON p.submitted_by = u.id 
-        LEFT JOIN users u2 ON p.assigned_to = u2.id
-        WHERE p.submitted_by = ?
-        ORDER BY p.created_at DESC
-    ''', (user_id,))
-    problems = c.fetchall()
-    conn.close()
-    
-    return problems
-
-# Assign user to problem
-def assign_to_problem(problem_id, user_id):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    # Update the main problem assignment
-    c.execute('UPDATE problems SET assigned_to = ? WHERE id = ?', (user_id, problem_id))
-    
-    # Check if already assigned in assignments table
-    c.execute('SELECT * FROM assignments WHERE problem_id = ? AND user_id = ?', 
-              (problem_id, user_id))
-    existing = c.fetchone()
-    
-    if not existing:
-        c.execute('INSERT INTO assignments (problem_id, user_id) VALUES (?, ?)', 
-                  (problem_id, user_id))
-    
-    conn.commit()
-    conn.close()
-    return True
-
-# Get assignments for problem
-def get_problem_assignments(problem_id):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    c.execute('''
-        SELECT a.*, u.name as user_name 
-        FROM assignments a 
-        JOIN users u ON a.user_id = u.id 
-        WHERE a.problem_id = ?
-    ''', (problem_id,))
-    assignments = c.fetchall()
-    conn.close()
-    
-    return assignments
-
-# Add calendar event
-def add_calendar_event(problem_id, title, description, event_date, created_by):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    c.execute('''
-        INSERT INTO calendar_events (problem_id, title, description, event_date, created_by)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (problem_id, title, description, event_date, created_by))
-    
-    conn.commit()
-    conn.close()
-
-# Get calendar events
-def get_calendar_events(user_id=None):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    if user_id:
-        c.execute('''
-            SELECT ce.*, p.title as problem_title, u.name as created_by_name
-            FROM calendar_events ce
-            JOIN problems p ON ce.problem_id = p.id
-            JOIN users u ON ce.created_by = u.id
-            WHERE ce.created_by = ? OR ce.problem_id IN (
-                SELECT problem_id FROM assignments WHERE user_id = ?
-            )
-            ORDER BY ce.event_date
-        ''', (user_id, user_id))
-    else:
-        c.execute('''
-            SELECT ce.*, p.title as problem_title, u.name as created_by_name
-            FROM calendar_events ce
-            JOIN problems p ON ce.problem_id = p.id
-            JOIN users u ON ce.created_by = u.id
-            ORDER BY ce.event_date
-        ''')
-    
-    events = c.fetchall()
-    conn.close()
-    return events
-
-# File attachment functions
-def save_file_attachment(problem_id, filename, file_data, file_type, uploaded_by):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    c.execute('''
-        INSERT INTO file_attachments (problem_id, filename, file_data, file_type, uploaded_by)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (problem_id, filename, file_data, file_type, uploaded_by))
-    
-    conn.commit()
-    conn.close()
-
-def get_file_attachments(problem_id):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    c.execute('''
-        SELECT fa.*, u.name as uploaded_by_name
-        FROM file_attachments fa
-        JOIN users u ON fa.uploaded_by = u.id
-        WHERE fa.problem_id = ?
-        ORDER BY fa.uploaded_at DESC
-    ''', (problem_id,))
-    
-    attachments = c.fetchall()
-    conn.close()
-    return attachments
-
-def get_file_attachment(file_id):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    c.execute('SELECT * FROM file_attachments WHERE id = ?', (file_id,))
-    attachment = c.fetchone()
-    conn.close()
-    return attachment
-
-# Search functions
-def save_search_result(problem_id, search_query, result_title, result_url, result_snippet, search_engine):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    c.execute('''
-        INSERT INTO search_results (problem_id, search_query, result_title, result_url, result_snippet, search_engine)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (problem_id, search_query, result_title, result_url, result_snippet, search_engine))
-    
-    conn.commit()
-    conn.close()
-
-def get_search_results(problem_id):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    c.execute('''
-        SELECT * FROM search_results 
-        WHERE problem_id = ? 
-        ORDER BY searched_at DESC
-    ''', (problem_id,))
-    
-    results = c.fetchall()
-    conn.close()
-    return results
+from http_client import get_page_session
+from page_extract import read_capped, extract_text_fast, extract_text_full, truncate_content
+from web_cache import SearchCache, PageCache, fetch_with_cache
+from database import (
+    PRIORITY_ORDER, init_db, generate_ticket_id, hash_password, authenticate_user, register_user,
+    submit_problem, get_all_problems, get_user_problems, assign_to_problem, get_problem_assignments,
+    add_calendar_event, get_calendar_events, save_file_attachment, get_file_attachments, get_file_attachment,
+    save_search_result, get_search_results, update_problem_status, get_all_users
+)
 
 # Web search functionality
+@st.cache_resource
+def get_search_cache():
+    """Shared query-result cache, created once per server process"""
+    return SearchCache()
+
 def search_web(query, max_results=5):
-    """Search using DuckDuckGo"""
+    """Search using DuckDuckGo, answering repeated queries from the cache"""
+    cache = get_search_cache()
+    cached = cache.lookup(query, max_results)
+    if cached is not None:
+        return cached
+    
     try:
         with DDGS() as ddgs:
             results = list(ddgs.text(query, max_results=max_results))
+            if results:
+                cache.store(query, max_results, results)
             return results
     except Exception as e:
         st.error(f"Search error: {e}")
         return []
 
-def search_with_beautiful_soup(url):
-    """Extract content from a URL using BeautifulSoup"""
+@st.cache_resource
+def get_page_cache():
+    """Shared extracted-content cache, also used by the pandas build resolver"""
+    return PageCache()
+
+def search_with_beautiful_soup(url, fast=True):
+    """Extract content from a URL using BeautifulSoup
+    
+    The fast mode streams at most MAX_DOWNLOAD_BYTES of the page and reads
+    only its main content region with lxml; fast=False parses the complete
+    document with html.parser. Extracted content is cached per URL and
+    revalidated with a conditional GET once it goes stale.
+    """
+    def parse(response):
+        if fast:
+            title, text = extract_text_fast(read_capped(response))
+        else:
+            title, text = extract_text_full(read_capped(response, max_bytes=None))
+        return {'title': title, 'content': truncate_content(text)}  # Limit content length
+    
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Extract relevant content
-        title = soup.title.string if soup.title else "No title"
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Get text content
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        return {
-            'title': title,
-            'content': text[:1000] + '...' if len(text) > 1000 else text,  # Limit content length
-            'url': url
-        }
+        content = fetch_with_cache(get_page_session(), get_page_cache(), url, parse, timeout=10,
+                                   variant='fast' if fast else 'full')
+        return dict(content, url=url)
     except Exception as e:
         return {'error': str(e)}
 
+def extract_many(urls, max_workers=8, per_host_limit=2, deadline=30):
+    """Extract content from several URLs concurrently.
+    
+    Yields (url, content) pairs in completion order. At most per_host_limit
+    requests run against the same host at once, and any URL still pending
+    when the overall deadline expires is reported as an error.
+    """
+    host_limits = {}
+    for url in urls:
+        host = urlparse(url).netloc
+        if host not in host_limits:
+            host_limits[host] = threading.BoundedSemaphore(per_host_limit)
+    
+    def fetch(url):
+        with host_limits[urlparse(url).netloc]:
+            return search_with_beautiful_soup(url)
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {executor.submit(fetch, url): url for url in urls}
+    pending = dict(futures)
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            del pending[future]
+            yield futures[future], future.result()
+    except FuturesTimeoutError:
+        for future, url in pending.items():
+            if future.done():
+                yield url, future.result()
+            else:
+                yield url, {'error': f"Not finished within the {deadline}s deadline"}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
 # Document processing functions
 def extract_text_from_pdf(file):
     """Extract text from PDF file"""
@@ -441,35 +151,6 @@ def process_uploaded_file(file):
     else:
         return "Unsupported file type"
 
-# Update problem status
-def update_problem_status(problem_id, new_status, resolution=None):
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    
-    if new_status == 'solved' and resolution:
-        c.execute('''
-            UPDATE problems 
-            SET status = ?, resolution = ?, resolved_at = CURRENT_TIMESTAMP 
-            WHERE id = ?
-        ''', (new_status, resolution, problem_id))
-    else:
-        c.execute('UPDATE problems SET status = ? WHERE id = ?', (new_status, problem_id))
-    
-    conn.commit()
-    conn.close()
-
-# Get all users for assignment
-def get_all_users():
-    conn = sqlite3.connect('problem_solving.db')
-    c = conn.cursor()
-    c.execute('SELECT id, name, email, role, created_at FROM users')
-    users = c.fetchall()
-    conn.close()
-    return users
-
-# Priority mapping for sorting
-PRIORITY_ORDER = {'Critical': 1, 'High': 2, 'Medium': 3, 'Low': 4}
-
 def main():
     st.set_page_config(page_title="Enhanced Problem Solving Platform", page_icon="🔧", layout="wide")
     
@@ -1025,44 +706,68 @@ def show_web_search(user):
         
         if st.button("Search Web") and search_query:
             with st.spinner("Searching..."):
-                results = search_web(search_query, max_results)
+                # Keep results across reruns so the per-result buttons below keep working
+                st.session_state.web_search = {
+                    'query': search_query,
+                    'results': search_web(search_query, max_results)
+                }
+        
+        web_search = st.session_state.get('web_search')
+        if web_search:
+            results = web_search['results']
+            
+            if results:
+                st.success(f"Found {len(results)} results for '{web_search['query']}'")
                 
-                if results:
-                    st.success(f"Found {len(results)} results")
-                    
-                    for i, result in enumerate(results):
-                        with st.expander(f"{i+1}. {result['title']}"):
-                            st.write(f"**URL:** {result['href']}")
-                            st.write(f"**Snippet:** {result['body']}")
-                            
-                            col_s1, col_s2 = st.columns(2)
-                            with col_s1:
-                                if st.button(f"Save Result", key=f"save_{i}"):
-                                    if problem_id:
-                                        ticket_id = int(problem_id.split(' - ')[0])
-                                        save_search_result(
-                                            ticket_id,
-                                            search_query,
-                                            result['title'],
-                                            result['href'],
-                                            result['body'],
-                                            "DuckDuckGo"
-                                        )
-                                        st.success("Result saved to ticket!")
+                if st.button("Extract All Results"):
+                    progress = st.progress(0.0, text="Extracting content...")
+                    urls = [result['href'] for result in results]
+                    for done, (url, content) in enumerate(extract_many(urls), start=1):
+                        progress.progress(done / len(urls), text=f"Extracted {done}/{len(urls)}")
+                        with st.expander(f"📄 {content.get('title') or url}"):
+                            st.write(f"**URL:** {url}")
+                            if 'error' not in content:
+                                st.write(content['content'])
+                            else:
+                                st.error(f"Extraction failed: {content['error']}")
+                
+                for i, result in enumerate(results):
+                    with st.expander(f"{i+1}. {result['title']}"):
+                        st.write(f"**URL:** {result['href']}")
+                        st.write(f"**Snippet:** {result['body']}")
+                        
+                        col_s1, col_s2 = st.columns(2)
+                        with col_s1:
+                            if st.button(f"Save Result", key=f"save_{i}"):
+                                if problem_id:
+                                    ticket_id = int(problem_id.split(' - ')[0])
+                                    save_search_result(
+                                        ticket_id,
+                                        web_search['query'],
+                                        result['title'],
+                                        result['href'],
+                                        result['body'],
+                                        "DuckDuckGo"
+                                    )
+                                    st.success("Result saved to ticket!")
+                                else:
+                                    st.error("Please select a ticket to save the result")
+                        
+                        with col_s2:
+                            if st.button(f"Extract Content", key=f"extract_{i}"):
+                                with st.spinner("Extracting content..."):
+                                    content = search_with_beautiful_soup(result['href'])
+                                    if 'error' not in content:
+                                        st.write("**Extracted Content:**")
+                                        st.text_area("Content", content['content'], height=200, key=f"content_{i}")
                                     else:
-                                        st.error("Please select a ticket to save the result")
-                            
-                            with col_s2:
-                                if st.button(f"Extract Content", key=f"extract_{i}"):
-                                    with st.spinner("Extracting content..."):
-                                        content = search_with_beautiful_soup(result['href'])
-                                        if 'error' not in content:
-                                            st.write("**Extracted Content:**")
-                                            st.text_area("Content", content['content'], height=200, key=f"content_{i}")
-                                        else:
-                                            st.error(f"Extraction failed: {content['error']}")
-                else:
-                    st.error("No results found or search failed")
+                                        st.error(f"Extraction failed: {content['error']}")
+            else:
+                st.error("No results found or search failed")
+        
+        cache_stats = get_search_cache().stats()
+        st.caption(f"Search cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                   f"{cache_stats['entries']} cached queries")
     
     with tab2:
         st.subheader("Saved Search Results")
@@ -1104,6 +809,10 @@ def show_web_search(user):
                     st.text_area("Extracted Content", content['content'], height=300)
                 else:
                     st.error(f"Extraction failed: {content['error']}")
+        
+        page_stats = get_page_cache().stats()
+        st.caption(f"Page cache: {page_stats['entries']} pages ({page_stats['bytes'] / 1024:.0f} KiB), "
+                   f"{page_stats['hits']} hits, {page_stats['revalidated']} revalidated")
 
 # Add credits footer
 st.markdown("---")
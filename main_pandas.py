@@ -4,7 +4,6 @@ Pandas Build Issue Resolver - Complete Solution Package
 Handles installation issues, web research, and automated ticket generation
 """
 
-import requests
 from bs4 import BeautifulSoup
 import re
 import time
@@ -13,11 +12,67 @@ import json
 import subprocess
 import sys
 import os
+import importlib.metadata
+import shlex
+import shutil
+import sysconfig
+import tempfile
+import threading
+import venv
 from pathlib import Path
 import argparse
+import glob
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+from log_analysis import FATAL_PATTERNS, LogScanner, analyze_text, analyze_file, log_environment, watch_log
+from command_runner import run_command
+from http_client import get_session, is_rate_limited, RateLimitedError, CircuitOpenError
+from pypi_client import PyPIClient, BUILD_PACKAGES
+from web_cache import PageCache, TTLCache, fetch_with_cache
+from wheelhouse import Wheelhouse, requirements_from_command
+from resolver_config import ConfigError, load_config, validate_config
+from knowledge_base import DEFAULT_KNOWLEDGE_BASE, OutcomeStore, environment_fingerprint, log_fingerprints
+
+# Upstream endpoints for each scraped source; override them to point the
+# resolver at a mirror or at fixture_server.py for offline runs
+DEFAULT_BASE_URLS = {
+    'stackexchange_api': 'https://api.stackexchange.com',
+    'stackoverflow': 'https://stackoverflow.com',
+    'github_api': 'https://api.github.com',
+    'github': 'https://github.com',
+    'pypi': 'https://pypi.org'
+}
+
+# Most frequent log findings shown with context in the report
+MAX_REPORTED_FINDINGS = 10
+
+# Where watched solution commands write their build logs
+SOLUTION_LOG_DIR = 'resolver_logs'
+
+# Search queries for a log's most frequent findings; {message} is the normalized finding text
+RESEARCH_QUERIES = {
+    'numpy_headers': "pandas build numpy headers won't be automatically included",
+    'package_config': "pandas build package is absent from the packages configuration",
+    'compilation_error': "pandas build {message}",
+    'missing_dependencies': "pandas install {message}"
+}
+
+# File names treated as build logs when batch mode is given a directory
+BATCH_LOG_PATTERNS = ('*.log', '*.log.gz', '*.txt')
+
+# Bumped whenever a field of the JSON report changes meaning or is removed
+REPORT_SCHEMA_VERSION = 1
+
+# Finding fields kept in the JSON report; surrounding context lines are left out
+REPORT_FINDING_FIELDS = ('fingerprint', 'category', 'message', 'count', 'first_line', 'example')
+
+# Characters of a failed solution's output kept in reports
+MAX_REPORTED_ERROR_CHARS = 2000
 
 class ComprehensivePandasResolver:
-    def __init__(self):
+    def __init__(self, base_urls=None, wheelhouse=None, offline=False, config=None,
+                 knowledge_base=DEFAULT_KNOWLEDGE_BASE):
         self.issue_data = {
             'title': 'Pandas Build Failure: Comprehensive Analysis and Solutions',
             'description': '',
@@ -28,19 +83,64 @@ class ComprehensivePandasResolver:
             'references': [],
             'solutions_tried': []
         }
-        self.setup_environment_info()
+        # Settings from resolver_config.json unless overrides are given
+        self.config = validate_config(config) if config is not None else load_config()
+        self.base_urls = {**DEFAULT_BASE_URLS, **(base_urls or {})}
+        self.session = get_session()
+        self.page_cache = PageCache()
+        self.pypi = PyPIClient(self.session, base_url=self.base_urls['pypi'],
+                               timeout=self.config['web_search']['timeout'])
+        self.log_scanner = LogScanner()
+        # Shared local wheel store used by solution attempts; offline runs install only from it
+        self.wheelhouse = Wheelhouse(wheelhouse) if wheelhouse else None
+        self.offline = offline
+        # Past solution outcomes used to decide which solution to try first; None disables it
+        self.knowledge_base = OutcomeStore(knowledge_base) if knowledge_base else None
+        # Probed lazily through self.environment; most reports never need a fresh probe
+        self.environment_cache = TTLCache(table='environment_probe', ttl=7 * 24 * 3600, max_entries=50)
+    
+    @property
+    def environment(self):
+        """Environment fingerprint, gathered on first use"""
+        if not self.issue_data['environment']:
+            self.setup_environment_info()
+        return self.issue_data['environment']
+    
+    def environment_cache_key(self):
+        """Identifies the interpreter and its installed packages as they are right now"""
+        site_packages = sysconfig.get_paths()['purelib']
+        return '|'.join([
+            os.path.realpath(sys.executable),
+            str(os.stat(sys.executable).st_mtime),
+            str(os.stat(site_packages).st_mtime) if os.path.isdir(site_packages) else ''
+        ])
     
     def setup_environment_info(self):
-        """Gather comprehensive environment information"""
+        """Gather comprehensive environment information
+        
+        Probes run in parallel and their result is cached on disk for this
+        interpreter until it, or its set of installed packages, changes.
+        """
         try:
-            import platform
-            self.issue_data['environment'] = {
-                'python_version': sys.version,
-                'platform': platform.platform(),
-                'processor': platform.processor(),
-                'pip_version': self.get_pip_version(),
-                'setuptools_version': self.get_setuptools_version()
-            }
+            key = self.environment_cache_key()
+            environment = self.environment_cache.get(key)
+            if environment is None:
+                import platform
+                probes = {
+                    'python_version': lambda: sys.version,
+                    'python_executable': lambda: sys.executable,
+                    'platform': platform.platform,
+                    'processor': platform.processor,
+                    'pip_version': self.get_pip_version,
+                    'setuptools_version': self.get_setuptools_version,
+                    'numpy_version': self.get_numpy_version,
+                    'compiler': self.get_compiler_info
+                }
+                with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+                    futures = {name: executor.submit(probe) for name, probe in probes.items()}
+                    environment = {name: future.result() for name, future in futures.items()}
+                self.environment_cache.set(key, environment)
+            self.issue_data['environment'] = environment
         except Exception as e:
             self.issue_data['environment'] = {'error': str(e)}
     
@@ -54,219 +154,285 @@ class ComprehensivePandasResolver:
             return "Unknown"
     
     def get_setuptools_version(self):
-        """Get setuptools version"""
+        """Get setuptools version without importing it"""
         try:
-            import setuptools
-            return setuptools.__version__
-        except:
+            return importlib.metadata.version('setuptools')
+        except importlib.metadata.PackageNotFoundError:
             return "Unknown"
     
-    def enhanced_web_scraper(self, queries):
+    def get_numpy_version(self):
+        """Get numpy version without importing it"""
+        try:
+            return importlib.metadata.version('numpy')
+        except importlib.metadata.PackageNotFoundError:
+            return "Not installed"
+    
+    def get_compiler_info(self):
+        """Find the C compiler a source build would use"""
+        configured = (sysconfig.get_config_var('CC') or 'cc').split()[0]
+        for compiler in (configured, 'cc', 'gcc', 'clang', 'cl'):
+            path = shutil.which(compiler)
+            if path:
+                break
+        else:
+            return {'available': False, 'path': None, 'version': None}
+        
+        try:
+            result = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10)
+            version = (result.stdout or result.stderr).strip().splitlines()[0]
+        except (OSError, subprocess.SubprocessError, IndexError):
+            version = "Unknown"
+        return {'available': True, 'path': path, 'version': version}
+    
+    def enhanced_web_scraper(self, queries, max_workers=None):
         """Enhanced web scraper with multiple sources"""
-        all_results = []
+        results = list(self.iter_web_results(queries, max_workers=max_workers))
         
-        for query in queries:
-            print(f"🔍 Searching: {query}")
-            
-            # Stack Overflow
-            so_results = self.scrape_stackoverflow(query)
-            all_results.extend(so_results)
-            
-            # GitHub Issues
-            gh_results = self.scrape_github_issues(query=query)
-            all_results.extend(gh_results)
-            
-            # Python Package Index (PyPI)
-            pypi_results = self.check_pypi_compatibility()
-            all_results.extend(pypi_results)
-            
-            time.sleep(1)  # Be respectful to servers
+        self.issue_data['scrape_metrics'] = self.session.rate_limiter.metrics()
+        for host, metrics in self.issue_data['scrape_metrics'].items():
+            if metrics['throttled'] or metrics['rate_limited'] or metrics['rejected']:
+                print(f"⏳ {host}: {metrics['throttled']} throttled ({metrics['wait_seconds']:.1f}s), "
+                      f"{metrics['rate_limited']} rate limited, {metrics['rejected']} rejected by circuit breaker")
         
-        # Remove duplicates
-        unique_results = []
-        seen_urls = set()
-        for result in all_results:
-            if result['url'] not in seen_urls:
-                unique_results.append(result)
-                seen_urls.add(result['url'])
+        return results
+    
+    def iter_web_results(self, queries, max_workers=None):
+        """Scrape every configured source for every query concurrently, yielding unique results as they arrive
+        
+        Requests are spaced per host by the shared session's rate limiter
+        rather than by sleeping between queries.
+        """
+        settings = self.config['web_search']
+        if not settings['enabled']:
+            return
+        sources = self.query_sources()
         
-        return unique_results
+        seen_urls = set()
+        with ThreadPoolExecutor(max_workers=max_workers or settings['max_workers']) as executor:
+            # PyPI metadata does not depend on the query, so it is checked once per run
+            futures = [executor.submit(self.check_pypi_compatibility)] if 'pypi' in settings['sources'] else []
+            for query in queries:
+                print(f"🔍 Searching: {query}")
+                futures.extend(executor.submit(scrape, query) for scrape in sources)
+            
+            # Remove duplicates as results arrive
+            for future in as_completed(futures):
+                for result in future.result():
+                    if result['url'] not in seen_urls:
+                        seen_urls.add(result['url'])
+                        yield result
+    
+    def query_sources(self):
+        """The configured per-query search functions"""
+        scrapers = {
+            'stackoverflow': lambda query: self.scrape_stackoverflow(query),
+            'github': lambda query: self.scrape_github_issues(query=query)
+        }
+        return [scrapers[source] for source in self.config['web_search']['sources'] if source in scrapers]
     
     def scrape_stackoverflow(self, query):
         """Scrape Stack Overflow with enhanced error handling"""
+        settings = self.config['web_search']
         try:
-            search_url = f"https://api.stackexchange.com/2.3/search/advanced"
+            search_url = f"{self.base_urls['stackexchange_api']}/2.3/search/advanced"
             params = {
                 'order': 'desc',
                 'sort': 'relevance',
                 'q': query,
                 'site': 'stackoverflow',
-                'pagesize': 5
+                'pagesize': settings['max_results']
             }
             
-            response = requests.get(search_url, params=params, timeout=15)
-            if response.status_code == 200:
+            def parse(response):
+                if is_rate_limited(response):
+                    raise RateLimitedError(f"HTTP {response.status_code} from {search_url}")
+                if response.status_code != 200:
+                    return None
                 data = response.json()
-                results = []
-                for item in data.get('items', []):
-                    results.append({
-                        'title': item['title'],
-                        'url': item['link'],
-                        'source': 'Stack Overflow',
-                        'score': item.get('score', 0),
-                        'answer_count': item.get('answer_count', 0)
-                    })
+                # The StackExchange API asks clients to back off via the response body
+                if data.get('backoff'):
+                    self.session.rate_limiter.pause(urlparse(search_url).hostname, data['backoff'])
+                return [{
+                    'title': item['title'],
+                    'url': item['link'],
+                    'source': 'Stack Overflow',
+                    'score': item.get('score', 0),
+                    'answer_count': item.get('answer_count', 0)
+                } for item in data.get('items', [])]
+            
+            results = fetch_with_cache(self.session, self.page_cache, search_url, parse,
+                                       params=params, timeout=settings['timeout'])
+            if results is not None:
                 return results
+        except (RateLimitedError, CircuitOpenError) as e:
+            # Falling back to HTML scraping while throttled only gets us blocked faster
+            print(f"Stack Overflow API throttled, skipping: {e}")
+            return []
         except Exception as e:
             print(f"Stack Overflow API failed: {e}")
         
         # Fallback to HTML scraping
         try:
-            search_url = f"https://stackoverflow.com/search?q={query.replace(' ', '+')}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(search_url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            search_url = f"{self.base_urls['stackoverflow']}/search?q={query.replace(' ', '+')}"
             
-            results = []
-            for item in soup.select('.question-hyperlink')[:5]:
-                title = item.get_text()
-                link = "https://stackoverflow.com" + item.get('href')
-                results.append({
-                    'title': title,
-                    'url': link,
-                    'source': 'Stack Overflow',
-                    'score': 0,
-                    'answer_count': 0
-                })
+            def parse(response):
+                soup = BeautifulSoup(response.content, 'html.parser')
+                results = []
+                for item in soup.select('.question-hyperlink')[:settings['max_results']]:
+                    title = item.get_text()
+                    link = self.base_urls['stackoverflow'] + item.get('href')
+                    results.append({
+                        'title': title,
+                        'url': link,
+                        'source': 'Stack Overflow',
+                        'score': 0,
+                        'answer_count': 0
+                    })
+                return results
             
-            return results
+            return fetch_with_cache(self.session, self.page_cache, search_url, parse, timeout=settings['timeout'])
         except Exception as e:
             print(f"Stack Overflow scraping failed: {e}")
             return []
     
     def scrape_github_issues(self, repo="pandas-dev/pandas", query=""):
         """Enhanced GitHub issues scraper"""
+        settings = self.config['web_search']
         try:
-            search_url = f"https://api.github.com/search/issues"
+            search_url = f"{self.base_urls['github_api']}/search/issues"
             params = {
                 'q': f'repo:{repo} {query}',
                 'sort': 'created',
                 'order': 'desc',
-                'per_page': 5
+                'per_page': settings['max_results']
             }
             headers = {
                 'Accept': 'application/vnd.github.v3+json',
                 'User-Agent': 'Pandas-Build-Helper/1.0'
             }
             
-            response = requests.get(search_url, params=params, headers=headers, timeout=15)
-            if response.status_code == 200:
-                data = response.json()
-                results = []
-                for item in data.get('items', []):
-                    results.append({
-                        'title': item['title'],
-                        'url': item['html_url'],
-                        'source': 'GitHub',
-                        'state': item['state'],
-                        'created_at': item['created_at']
-                    })
+            def parse(response):
+                if is_rate_limited(response):
+                    raise RateLimitedError(f"HTTP {response.status_code} from {search_url}")
+                if response.status_code != 200:
+                    return None
+                return [{
+                    'title': item['title'],
+                    'url': item['html_url'],
+                    'source': 'GitHub',
+                    'state': item['state'],
+                    'created_at': item['created_at']
+                } for item in response.json().get('items', [])]
+            
+            results = fetch_with_cache(self.session, self.page_cache, search_url, parse,
+                                       params=params, headers=headers, timeout=settings['timeout'])
+            if results is not None:
                 return results
+        except (RateLimitedError, CircuitOpenError) as e:
+            print(f"GitHub API throttled, skipping: {e}")
+            return []
         except Exception as e:
             print(f"GitHub API failed: {e}")
         
         # HTML fallback
         try:
-            search_url = f"https://github.com/{repo}/issues?q={query.replace(' ', '+')}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(search_url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            search_url = f"{self.base_urls['github']}/{repo}/issues?q={query.replace(' ', '+')}"
             
-            results = []
-            for item in soup.select('[data-hovercard-type="issue"]')[:5]:
-                title = item.get_text().strip()
-                link = "https://github.com" + item.get('href')
-                results.append({
-                    'title': title,
-                    'url': link,
-                    'source': 'GitHub',
-                    'state': 'unknown',
-                    'created_at': 'unknown'
-                })
+            def parse(response):
+                soup = BeautifulSoup(response.content, 'html.parser')
+                results = []
+                for item in soup.select('[data-hovercard-type="issue"]')[:settings['max_results']]:
+                    title = item.get_text().strip()
+                    link = self.base_urls['github'] + item.get('href')
+                    results.append({
+                        'title': title,
+                        'url': link,
+                        'source': 'GitHub',
+                        'state': 'unknown',
+                        'created_at': 'unknown'
+                    })
+                return results
             
-            return results
+            return fetch_with_cache(self.session, self.page_cache, search_url, parse, timeout=settings['timeout'])
         except Exception as e:
             print(f"GitHub scraping failed: {e}")
             return []
     
-    def check_pypi_compatibility(self):
-        """Check PyPI for pandas compatibility information"""
-        try:
-            url = "https://pypi.org/pypi/pandas/json"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                info = data.get('info', {})
+    def check_pypi_compatibility(self, packages=BUILD_PACKAGES):
+        """Check PyPI for release and wheel availability of pandas and its build dependencies"""
+        python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+        results = []
+        
+        for package in packages:
+            try:
+                metadata = self.pypi.get_metadata(package)
+                version = metadata['version']
+                has_wheel = self.pypi.has_wheel(package, python_version)
                 
-                return [{
-                    'title': f"PyPI: pandas {info.get('version', 'unknown')} - {info.get('summary', '')}",
-                    'url': f"https://pypi.org/project/pandas/{info.get('version', '')}/",
+                results.append({
+                    'title': f"PyPI: {metadata['name']} {version} - {metadata['summary']}",
+                    'url': f"{self.base_urls['pypi']}/project/{package}/{version}/",
                     'source': 'PyPI',
-                    'requires_python': info.get('requires_python', 'Not specified')
-                }]
-        except Exception as e:
-            print(f"PyPI check failed: {e}")
+                    'requires_python': metadata['requires_python'] or 'Not specified',
+                    'wheel_available': has_wheel,
+                    'latest_with_wheel': version if has_wheel else self.pypi.latest_version_with_wheel(package, python_version)
+                })
+            except Exception as e:
+                print(f"PyPI check failed for {package}: {e}")
         
-        return []
+        return results
     
     def deep_log_analysis(self, log_content):
-        """Comprehensive log analysis with pattern matching"""
-        analysis = {
-            'critical_issues': [],
-            'warnings': [],
-            'suggestions': [],
-            'statistics': {}
-        }
+        """Comprehensive log analysis with pattern matching, in a single pass over the log"""
+        return analyze_text(log_content, self.log_scanner)
+    
+    def analyze_log_file(self, source, workers=1):
+        """Stream-analyze a build log from a path, '-' for stdin, or a gzip'd log
         
-        # Pattern matching for different issue types
-        patterns = {
-            'numpy_headers': r"dependency.*numpy.*won't be automatically included",
-            'package_config': r"Package.*is absent from the.*packages.*configuration",
-            'compilation_error': r"error:|Error:|ERROR:",
-            'warning_messages': r"warning:|Warning:|WARNING:",
-            'python_version': r"python3\.(\d+)",
-            'build_success': r"Successfully installed|Running setup\.py install for",
-            'missing_dependencies': r"ModuleNotFoundError|ImportError"
-        }
+        Memory use is bounded by the read chunk size rather than the log size.
+        With workers > 1, uncompressed logs are split across that many processes.
+        """
+        return analyze_file(source, scanner=self.log_scanner, workers=workers, fatal_patterns=FATAL_PATTERNS)
+    
+    def watch_log_file(self, path, stop_on_fatal=False, idle_timeout=30):
+        """Analyze a build log while pip is still writing it, printing progress as it grows
         
-        for category, pattern in patterns.items():
-            matches = re.findall(pattern, log_content, re.IGNORECASE)
-            analysis['statistics'][category] = len(matches)
-            
-            if category == 'numpy_headers' and matches:
-                analysis['critical_issues'].append(f"NumPy header path issues: {len(matches)} warnings")
-            elif category == 'package_config' and matches:
-                analysis['warnings'].append(f"Package configuration issues: {len(matches)} warnings")
-            elif category == 'compilation_error' and matches:
-                analysis['critical_issues'].append(f"Compilation errors: {len(matches)} found")
-            elif category == 'build_success' and matches:
-                analysis['suggestions'].append("Build completed (with warnings)")
-        
-        # Additional analysis
-        if analysis['statistics'].get('numpy_headers', 0) > 50:
-            analysis['critical_issues'].append("High volume of NumPy header warnings - potential path configuration issue")
-        
-        return analysis
-    
-    def execute_solution(self, solution_name, commands):
-        """Execute a solution and track results"""
+        Stops when the log has been idle for idle_timeout seconds, or at the
+        first fatal build error if stop_on_fatal is set.
+        """
+        def on_update(analysis):
+            stats = analysis['statistics']
+            print(f"📈 {analysis['lines']} lines | {stats['compilation_error']} errors | "
+                  f"{stats['warning_messages']} warnings | {stats['numpy_headers']} NumPy header warnings",
+                  file=sys.stderr)
+        
+        def on_fatal(fatal):
+            print(f"🛑 Fatal build error at line {fatal['line']}: {fatal['text']}", file=sys.stderr)
+            return stop_on_fatal
+        
+        return watch_log(path, on_update=on_update, on_fatal=on_fatal, scanner=self.log_scanner,
+                         idle_timeout=idle_timeout)
+    
+    def execute_solution(self, solution_name, commands, watch=False, log_dir=SOLUTION_LOG_DIR,
+                         pip=None, cancel=None, record=True, echo=False):
+        """Execute a solution and track results
+        
+        Command output is streamed through the log analyzer as it arrives;
+        with echo=True it is also printed live. With watch=True each pip
+        command's build log is saved under log_dir (unless reporting.save_logs
+        is off) and the solution is abandoned at the first fatal build error.
+        pip is the command prefix that runs pip (the current environment's pip
+        by default). The solution succeeds only if every pip command it ran
+        exited 0; it is marked cancelled only if cancel interrupted or skipped
+        one of its commands. Commands get
+        solutions.timeout seconds each; a command that runs out of time is
+        recorded with timed_out set and ends the solution. With
+        solutions.retry_failed, a failed or timed-out command is run once more
+        before the failure counts.
+        """
         print(f"🚀 Executing: {solution_name}")
+        settings = self.config['solutions']
+        attempts = 2 if settings['retry_failed'] else 1
         
         results = {
             'solution': solution_name,
@@ -276,8 +442,13 @@ class ComprehensivePandasResolver:
             'error': None
         }
         
+        ran = failed = cancelled = False
         try:
             for command in commands:
+                if cancel is not None and cancel.is_set():
+                    cancelled = True
+                    break
+                
                 if command.startswith('#'):
                     print(f"  💡 {command}")
                     continue
@@ -289,37 +460,210 @@ class ComprehensivePandasResolver:
                 
                 # Execute command
                 if command.startswith('pip install'):
-                    result = subprocess.run(
-                        command.split(),
-                        capture_output=True,
-                        text=True,
-                        timeout=300  # 5 minute timeout
-                    )
+                    # Solutions quote specifiers such as "pandas<2.2" for the shell; pip must not see the quotes
+                    argv = pip + shlex.split(command)[1:] if pip else shlex.split(command)
+                    if self.wheelhouse:
+                        argv += self.wheelhouse.pip_args(offline=self.offline)
+                    log_path = None
+                    if watch and self.config['reporting']['save_logs']:
+                        Path(log_dir).mkdir(parents=True, exist_ok=True)
+                        slug = re.sub(r'[^a-z0-9]+', '-', solution_name.lower()).strip('-')
+                        log_path = Path(log_dir) / f"{slug}-{len(results['outputs']) + 1}.log"
+                    
+                    for attempt in range(1, attempts + 1):
+                        run = run_command(argv, timeout=settings['timeout'], cancel=cancel, stop_on_fatal=watch,
+                                          log_path=log_path, scanner=self.log_scanner,
+                                          on_line=(lambda line: print(f"    │ {line}")) if echo else None)
+                        fatal = run['fatal'] if run['stopped'] == 'fatal' else None
+                        if run['stopped'] == 'cancelled' or (run['returncode'] == 0 and not fatal):
+                            break
+                        if attempt < attempts:
+                            print(f"    🔁 Retrying: {command}")
                     
                     results['outputs'].append({
                         'command': command,
-                        'returncode': result.returncode,
-                        'stdout': result.stdout,
-                        'stderr': result.stderr
+                        'returncode': run['returncode'],
+                        'stdout': run['output'],
+                        'stderr': '',
+                        'output_truncated': run['output_truncated'],
+                        'fatal': fatal,
+                        'statistics': run['analysis']['statistics'],
+                        'seconds': round(run['wall_seconds'], 2),
+                        'cpu_seconds': round(run['cpu_seconds'], 2) if run['cpu_seconds'] is not None else None,
+                        'peak_rss_mb': round(run['peak_rss_bytes'] / 2 ** 20, 1) if run['peak_rss_bytes'] else None,
+                        'attempts': attempt,
+                        'timed_out': run['stopped'] == 'timeout'
                     })
+                    usage = self._format_usage(results['outputs'][-1])
                     
-                    if result.returncode == 0:
-                        print(f"    ✅ Success: {command}")
-                        results['success'] = True
+                    ran = True
+                    if run['stopped'] == 'cancelled':
+                        cancelled = True
+                        break
+                    if run['stopped'] == 'timeout':
+                        print(f"    ⏱️  Timed out: {command} {usage}")
+                        failed = True
+                        results['error'] = f"Command timed out after {settings['timeout']} seconds\n{run['output']}"
+                        break
+                    if fatal:
+                        print(f"    🛑 Stopped at line {fatal['line']}: {fatal['text']} {usage}")
+                        failed = True
+                        results['error'] = run['output']
+                        break
+                    elif run['returncode'] == 0:
+                        print(f"    ✅ Success: {command} {usage}")
                     else:
-                        print(f"    ❌ Failed: {command}")
-                        results['error'] = result.stderr
+                        print(f"    ❌ Failed: {command} {usage}")
+                        failed = True
+                        results['error'] = run['output']
                 else:
                     print(f"    ⚠️  Skipping (non-pip command): {command}")
         
-        except subprocess.TimeoutExpired:
-            results['error'] = "Command timed out after 5 minutes"
         except Exception as e:
+            failed = True
             results['error'] = str(e)
         
-        self.issue_data['solutions_tried'].append(results)
+        # A solution only works if every pip command it ran succeeded
+        results['success'] = ran and not failed and not cancelled
+        if cancelled:
+            print(f"  ⏹️  Cancelled: {solution_name}")
+            results['cancelled'] = True
+        
+        if record:
+            self.issue_data['solutions_tried'].append(results)
         return results
     
+    @staticmethod
+    def _format_usage(output):
+        usage = f"{output['seconds']}s wall"
+        if output.get('cpu_seconds') is not None:
+            usage += f", {output['cpu_seconds']}s CPU"
+        if output.get('peak_rss_mb'):
+            usage += f", {output['peak_rss_mb']} MB peak RSS"
+        return f"({usage})"
+    
+    def ranked_solutions(self, log_analysis=None):
+        """The recommended solutions, ordered by past results on similar environments and failures
+        
+        The environment is the one the log came from (see build_environment).
+        Without a knowledge base this is the fixed priority order.
+        """
+        solutions = self.get_comprehensive_solutions()
+        if not self.knowledge_base:
+            return solutions
+        environment, _ = self.build_environment(log_analysis or {})
+        return self.knowledge_base.rank(solutions, environment_fingerprint(environment),
+                                        log_fingerprints(log_analysis or {}))
+    
+    def record_outcomes(self, results, log_analysis=None):
+        """Add solution results to the knowledge base"""
+        if self.knowledge_base:
+            self.knowledge_base.record(environment_fingerprint(self.environment),
+                                       log_fingerprints(log_analysis or {}), results)
+    
+    def run_solutions(self, watch=True, stop_on_success=None, echo=False, log_analysis=None):
+        """Try the recommended solutions, most promising first
+        
+        With watch=True a solution whose build hits a fatal error is abandoned
+        at once and the next one is started. stop_on_success defaults to
+        solutions.stop_on_success. The outcomes are recorded in the knowledge
+        base against log_analysis's findings.
+        """
+        if stop_on_success is None:
+            stop_on_success = self.config['solutions']['stop_on_success']
+        results = []
+        for solution in self.ranked_solutions(log_analysis):
+            result = self.execute_solution(solution['title'], solution['commands'], watch=watch, echo=echo)
+            results.append(result)
+            if result['success'] and stop_on_success:
+                break
+        self.record_outcomes(results, log_analysis)
+        return self.issue_data['solutions_tried']
+    
+    def prepare_wheelhouse(self):
+        """Download wheels for every requirement the solutions install into the wheelhouse"""
+        requirement_sets = [requirements_from_command(command)
+                            for solution in self.get_comprehensive_solutions()
+                            for command in solution['commands'] if command.startswith('pip install')]
+        return self.wheelhouse.populate(requirement_sets)
+    
+    def create_solution_env(self, env_dir):
+        """Create a throwaway virtualenv and return the command prefix that runs pip in it
+        
+        pip 22.3+ can install into another interpreter with --python, which
+        saves seeding every environment with its own copy of pip.
+        """
+        host_pip = re.search(r'pip (\d+)\.(\d+)', self.environment.get('pip_version', ''))
+        can_target = bool(host_pip) and (int(host_pip.group(1)), int(host_pip.group(2))) >= (22, 3)
+        venv.create(env_dir, with_pip=not can_target, clear=True)
+        
+        python = str(Path(env_dir) / ('Scripts/python.exe' if os.name == 'nt' else 'bin/python'))
+        if can_target:
+            return [sys.executable, '-m', 'pip', '--python', python]
+        return [python, '-m', 'pip']
+    
+    def _run_isolated_solution(self, solution, workdir, cancel):
+        if cancel.is_set():
+            return {'solution': solution['title'], 'commands': solution['commands'], 'outputs': [],
+                    'success': False, 'error': None, 'cancelled': True}
+        
+        started = time.monotonic()
+        env_dir = Path(workdir) / f"solution-{solution['priority']}"
+        pip = self.create_solution_env(env_dir)
+        setup_seconds = time.monotonic() - started
+        
+        results = self.execute_solution(solution['title'], solution['commands'], watch=True,
+                                        pip=pip, cancel=cancel, record=False)
+        results['environment'] = 'venv'
+        results['timings'] = {
+            'setup_seconds': round(setup_seconds, 2),
+            'total_seconds': round(time.monotonic() - started, 2)
+        }
+        return results
+    
+    def run_solutions_isolated(self, solutions=None, max_workers=None, stop_on_success=None, log_analysis=None):
+        """Try solutions concurrently, each in its own temporary virtualenv
+        
+        The environment being diagnosed is never modified. With
+        stop_on_success the first solution to succeed cancels the others,
+        killing their running pip commands. The most promising solutions are
+        started first and results are added to solutions_tried in that order.
+        max_workers and stop_on_success default to the solutions section of
+        the configuration. Outcomes are recorded in the knowledge base.
+        """
+        solutions = solutions or self.ranked_solutions(log_analysis)
+        rank = {solution['title']: position for position, solution in enumerate(solutions)}
+        max_workers = max_workers or self.config['solutions']['max_workers']
+        if stop_on_success is None:
+            stop_on_success = self.config['solutions']['stop_on_success']
+        cancel = threading.Event()
+        results = {}
+        
+        with tempfile.TemporaryDirectory(prefix='pandas-resolver-') as workdir:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(self._run_isolated_solution, solution, workdir, cancel): solution
+                           for solution in solutions}
+                for future in as_completed(futures):
+                    solution = futures[future]
+                    if future.cancelled():
+                        results[rank[solution['title']]] = {
+                            'solution': solution['title'], 'commands': solution['commands'], 'outputs': [],
+                            'success': False, 'error': None, 'cancelled': True
+                        }
+                        continue
+                    
+                    result = results[rank[solution['title']]] = future.result()
+                    if result['success'] and stop_on_success and not cancel.is_set():
+                        print(f"🏁 {solution['title']} succeeded; cancelling the remaining attempts")
+                        cancel.set()
+                        for other in futures:
+                            other.cancel()
+        
+        ordered = [results[position] for position in sorted(results)]
+        self.issue_data['solutions_tried'].extend(ordered)
+        self.record_outcomes(ordered, log_analysis)
+        return ordered
+    
     def get_comprehensive_solutions(self):
         """Get all possible solutions with prioritization"""
         return [
@@ -375,7 +719,7 @@ class ComprehensivePandasResolver:
                     '# Or try the latest pre-release',
                     'pip install --pre pandas',
                     '# Install with version constraints',
-                    'pip install "pandas>=2.1,<2.2" "numpy>=1.21,<1.25"'
+                    self.constrained_install_command()
                 ]
             },
             {
@@ -386,21 +730,154 @@ class ComprehensivePandasResolver:
                     '# Using conda (if available)',
                     '# conda install pandas',
                     '# conda install -c conda-forge pandas',
-                    '# Using pip with cache clearance',
-                    'pip cache purge',
-                    'pip install pandas --no-cache-dir',
+                    '# Reinstall, replacing a possibly broken installed copy',
+                    'pip install --force-reinstall pandas',
                     '# Install from GitHub main branch',
                     '# pip install git+https://github.com/pandas-dev/pandas.git'
                 ]
             }
         ]
     
+    def constrained_install_command(self):
+        """pip install command pinned to the first configured pandas and numpy version ranges"""
+        compatibility = self.config['compatibility']
+        pandas_versions = compatibility['pandas_versions'] or ['>=2.1,<2.2']
+        numpy_versions = compatibility['numpy_versions'] or ['>=1.21,<1.25']
+        return f'pip install "pandas{pandas_versions[0]}" "numpy{numpy_versions[0]}"'
+    
+    def python_supported(self, python_version=None):
+        """Whether a Python version (this one by default) is one of the configured python_versions
+        
+        None when no versions are configured or the version is unknown.
+        """
+        supported = self.config['compatibility']['python_versions']
+        if python_version is None:
+            python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+        if not supported or not python_version:
+            return None
+        return python_version in supported
+    
+    def build_environment(self, log_analysis):
+        """(environment, source) of the build a log came from
+        
+        A log analyzed in batch mode carries the environment recovered from
+        the log itself (source 'log'); otherwise the log is taken to come
+        from this machine (source 'host').
+        """
+        if 'environment' in log_analysis:
+            return log_analysis['environment'], 'log'
+        return self.environment, 'host'
+    
+    def research_queries(self, log_analysis, max_queries=3):
+        """Search queries for the most significant problems found in a log"""
+        candidates = []
+        if log_analysis.get('fatal'):
+            candidates.append(f"pandas install {log_analysis['fatal']['text']}")
+        for finding in log_analysis.get('findings', []):
+            template = RESEARCH_QUERIES.get(finding['category'])
+            if template:
+                candidates.append(template.format(message=finding['message']))
+        
+        queries = []
+        for query in candidates:
+            # Placeholders and punctuation only make search results worse
+            query = ' '.join(re.sub(r"<\w+>|[^\w\s.'-]", ' ', query).split()[:10])
+            if query not in queries:
+                queries.append(query)
+        return queries[:max_queries]
+    
+    def collect_references(self, queries, max_workers=None):
+        """Search the configured sources for each query; returns {query: results}
+        
+        Every query is searched once however many logs asked for it, and
+        results are served from the shared page cache where possible.
+        """
+        references = {query: [] for query in queries}
+        if not self.config['web_search']['enabled']:
+            return references
+        with ThreadPoolExecutor(max_workers=max_workers or self.config['web_search']['max_workers']) as executor:
+            futures = {}
+            for query in references:
+                print(f"🔍 Searching: {query}")
+                for scrape in self.query_sources():
+                    futures[executor.submit(scrape, query)] = query
+            for future in as_completed(futures):
+                references[futures[future]].extend(future.result())
+        return references
+    
+    def generate_fleet_summary(self, entries):
+        """Summarize a batch of analyzed logs: per-log status, recurring findings and shared references"""
+        analyzed = [entry for entry in entries if 'analysis' in entry]
+        failed = [entry for entry in entries if 'error' in entry]
+        
+        summary = f"""
+# 🐼 Pandas Build Fleet Summary
+
+## 📊 Overview
+- **Logs Analyzed**: {len(analyzed)}
+- **Logs That Could Not Be Read**: {len(failed)}
+- **Logs With Critical Issues**: {sum(1 for entry in analyzed if entry['analysis']['critical_issues'])}
+- **Logs With Fatal Build Errors**: {sum(1 for entry in analyzed if entry['analysis'].get('fatal'))}
+
+---
+
+## 📋 Logs
+| Log | Lines | Critical | Warnings | Fatal error | Report |
+|-----|-------|----------|----------|-------------|--------|
+"""
+        for entry in analyzed:
+            analysis = entry['analysis']
+            fatal = analysis['fatal']['text'] if analysis.get('fatal') else ''
+            report = f"[report]({entry['report']})" if entry.get('report') else ''
+            summary += (f"| {entry['log']} | {analysis.get('lines', '')} | {len(analysis['critical_issues'])} | "
+                        f"{len(analysis['warnings'])} | {self._table_cell(fatal)} | {report} |\n")
+        for entry in failed:
+            summary += f"| {entry['log']} | | | | ❌ {self._table_cell(entry['error'])} | |\n"
+        
+        recurring = {}
+        for entry in analyzed:
+            for finding in entry['analysis'].get('findings', []):
+                merged = recurring.setdefault(finding['fingerprint'], {
+                    'category': finding['category'], 'message': finding['message'], 'logs': 0, 'count': 0
+                })
+                merged['logs'] += 1
+                merged['count'] += finding['count']
+        
+        summary += "\n---\n\n## 🔁 Recurring Findings\n"
+        if recurring:
+            summary += "| Finding | Category | Logs | Occurrences |\n|---------|----------|------|-------------|\n"
+            for finding in sorted(recurring.values(), key=lambda f: (-f['logs'], -f['count']))[:20]:
+                summary += (f"| `` {self._table_cell(finding['message'])} `` | {finding['category']} | "
+                            f"{finding['logs']} | {finding['count']} |\n")
+        else:
+            summary += "\nNo findings.\n"
+        
+        shared = {}
+        for entry in analyzed:
+            for reference in entry.get('references', []):
+                shared.setdefault(reference['url'], [reference, 0])[1] += 1
+        if shared:
+            summary += "\n---\n\n## 📚 Shared References\n"
+            for reference, logs in sorted(shared.values(), key=lambda item: -item[1])[:20]:
+                summary += f"- [{reference['title']}]({reference['url']}) ({reference['source']}) - {logs} log(s)\n"
+        
+        summary += f"\n---\n*Summary generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n"
+        return summary
+    
+    @staticmethod
+    def _table_cell(text):
+        return str(text).replace('|', '\\|').replace('\n', ' ')
+    
     def generate_comprehensive_report(self, log_analysis, references, solutions_executed):
         """Generate a comprehensive report with all findings"""
         
         # Executive Summary
         critical_count = len(log_analysis['critical_issues'])
         warning_count = len(log_analysis['warnings'])
+        environment, environment_source = self.build_environment(log_analysis)
+        environment_heading = ("Build Environment (recovered from the log)" if environment_source == 'log'
+                               else "Environment Information")
+        python_version = environment.get('python_version', '') if environment_source == 'log' else None
         
         report = f"""
 # 🐼 Pandas Build Issue Resolution Report
@@ -415,6 +892,354 @@ class ComprehensivePandasResolver:
 
 ## 🔍 Detailed Analysis
 
-### Environment Information
+### {environment_heading}
 ```json
-{json.dumps(self.issue_data['environment'], indent=2)}
+{json.dumps(environment, indent=2)}
+```
+
+### Log Analysis
+- **Critical Issues**: {', '.join(log_analysis['critical_issues']) or 'None'}
+- **Warnings**: {', '.join(log_analysis['warnings']) or 'None'}
+- **Suggestions**: {', '.join(log_analysis['suggestions']) or 'None'}
+
+```json
+{json.dumps(log_analysis['statistics'], indent=2)}
+```
+"""
+
+        if self.python_supported(python_version) is False:
+            report += (f"\n⚠️ Python {python_version or f'{sys.version_info.major}.{sys.version_info.minor}'} is not "
+                       f"one of the supported versions ({', '.join(self.config['compatibility']['python_versions'])}).\n")
+        
+        if log_analysis.get('fatal'):
+            fatal = log_analysis['fatal']
+            report += f"\n**Fatal build error** at line {fatal['line']}: `{fatal['text']}`\n"
+        
+        findings = log_analysis.get('findings', [])
+        if findings:
+            report += f"\n### Findings ({len(findings)} distinct)\n"
+            for finding in findings[:MAX_REPORTED_FINDINGS]:
+                report += (f"\n#### {finding['category']} × {finding['count']} "
+                           f"(first at line {finding['first_line']})\n`{finding['message']}`\n")
+                context = finding['context']['before'] + [finding['example']] + finding['context']['after']
+                report += "\n```\n" + "\n".join(context) + "\n```\n"
+            if len(findings) > MAX_REPORTED_FINDINGS:
+                report += f"\n{len(findings) - MAX_REPORTED_FINDINGS} less frequent findings omitted.\n"
+
+        report += "\n---\n\n## 🛠️ Solutions Attempted\n"
+
+        for solution in solutions_executed:
+            status = "✅ Success" if solution['success'] else "❌ Failed"
+            if solution.get('cancelled'):
+                status = "⏹️ Cancelled"
+            report += f"\n### {solution['solution']} - {status}\n"
+            if solution.get('timings'):
+                report += (f"Isolated {solution['environment']}: {solution['timings']['total_seconds']}s "
+                           f"({solution['timings']['setup_seconds']}s setup)\n\n")
+            for output in solution['outputs']:
+                report += f"- `{output['command']}` → return code {output['returncode']}"
+                report += f" {self._format_usage(output)}\n" if 'seconds' in output else "\n"
+                if output.get('timed_out'):
+                    report += f"  - timed out after {output['seconds']}s\n"
+                if output.get('fatal'):
+                    report += f"  - stopped at line {output['fatal']['line']}: `{output['fatal']['text']}`\n"
+            if solution['error']:
+                report += f"\n```\n{solution['error'][-MAX_REPORTED_ERROR_CHARS:]}\n```\n"
+        
+        if not solutions_executed:
+            report += "\nNo solutions were executed.\n"
+        
+        report += "\n---\n\n## 📚 References\n"
+        for ref in references:
+            report += f"- [{ref['title']}]({ref['url']}) ({ref['source']})\n"
+        
+        if not references:
+            report += "\nNo references collected.\n"
+        
+        report += "\n---\n\n## 💡 Recommended Solutions\n"
+        for position, solution in enumerate(self.ranked_solutions(log_analysis), 1):
+            report += f"\n### {position}. {solution['title']}\n{solution['description']}\n"
+            history = solution.get('history')
+            if history and history['attempts']:
+                report += (f"\nWorked in {history['similar_successes']} of {history['similar_attempts']} similar "
+                           f"past runs ({history['successes']} of {history['attempts']} overall); "
+                           f"estimated {history['success_rate']:.0%} chance in about {history['expected_seconds']}s.\n")
+            report += "\n```bash\n"
+            report += "\n".join(solution['commands'])
+            report += "\n```\n"
+        
+        report += f"\n---\n*Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n"
+        
+        return report
+    
+    def build_report_data(self, log_analysis, references, solutions_executed, source=None):
+        """The report as plain data for JSON output
+        
+        Bulky text is left out: log samples, finding context and captured
+        command output are dropped, and a failed solution's error is cut to
+        the tail the Markdown report shows. environment_source says whether
+        the environment is the host's or was recovered from the log.
+        """
+        environment, environment_source = self.build_environment(log_analysis)
+        return {
+            'schema_version': REPORT_SCHEMA_VERSION,
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'source': source,
+            'title': self.issue_data['title'],
+            'error_type': self.issue_data['error_type'],
+            'severity': self.issue_data['severity'],
+            'environment': environment,
+            'environment_source': environment_source,
+            'python_supported': self.python_supported(
+                environment.get('python_version', '') if environment_source == 'log' else None),
+            'analysis': {
+                'lines': log_analysis.get('lines'),
+                'critical_issues': log_analysis['critical_issues'],
+                'warnings': log_analysis['warnings'],
+                'suggestions': log_analysis['suggestions'],
+                'statistics': log_analysis['statistics'],
+                'fatal': log_analysis.get('fatal'),
+                'findings': [{field: finding[field] for field in REPORT_FINDING_FIELDS}
+                             for finding in log_analysis.get('findings', [])],
+                'findings_overflow': log_analysis.get('findings_overflow', {})
+            },
+            'solutions': [{
+                'solution': solution['solution'],
+                'success': solution['success'],
+                'cancelled': solution.get('cancelled', False),
+                'error': solution['error'][-MAX_REPORTED_ERROR_CHARS:] if solution['error'] else None,
+                'environment': solution.get('environment'),
+                'timings': solution.get('timings'),
+                'outputs': [{key: value for key, value in output.items() if key not in ('stdout', 'stderr')}
+                            for output in solution['outputs']]
+            } for solution in solutions_executed],
+            'references': references
+        }
+    
+    def generate_json_report(self, log_analysis, references, solutions_executed, source=None, indent=2):
+        """JSON version of the comprehensive report"""
+        return json.dumps(self.build_report_data(log_analysis, references, solutions_executed, source),
+                          indent=indent, ensure_ascii=False)
+
+
+def append_jsonl(path, records):
+    """Append records to a JSON Lines file, one compact line per record
+    
+    Each line goes out in a single write to a file opened for appending, so
+    several batch runs can share one file without interleaving their lines.
+    """
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+            f.flush()
+
+
+def find_logs(target):
+    """Build logs named by a directory, a glob pattern or a single path"""
+    if os.path.isdir(target):
+        paths = {path for pattern in BATCH_LOG_PATTERNS for path in Path(target).glob(pattern)}
+    else:
+        paths = {Path(path) for path in glob.glob(target, recursive=True)}
+    return sorted(path for path in paths if path.is_file())
+
+
+def _report_name(log, taken):
+    name = re.sub(r'(\.gz)?$', '', log.name) + '.report.md'
+    stem, counter = name, 1
+    while name in taken:
+        counter += 1
+        name = f"{stem[:-len('.report.md')]}-{counter}.report.md"
+    taken.add(name)
+    return name
+
+
+def analyze_fleet_log(path):
+    """Analyze a log from another machine, with the environment recovered from the log under 'environment'"""
+    analysis = analyze_file(path, fatal_patterns=FATAL_PATTERNS)
+    analysis['environment'] = log_environment(path)
+    return analysis
+
+
+def run_batch(resolver, target, output_dir, jobs=None, research=False, jsonl_path=None):
+    """Analyze every log matching target in parallel and write per-log reports and a fleet summary
+    
+    With reporting.generate_json, or given jsonl_path, every log's JSON report
+    is also appended as one line to jsonl_path (reports.jsonl in output_dir
+    by default).
+    """
+    logs = find_logs(target)
+    if not logs:
+        print(f"❌ No build logs found for {target}", file=sys.stderr)
+        return None
+    
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"📚 Analyzing {len(logs)} logs with {jobs or os.cpu_count()} processes...", file=sys.stderr)
+    
+    analyses = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(analyze_fleet_log, str(log)): log for log in logs}
+        for future in as_completed(futures):
+            try:
+                analyses[futures[future]] = future.result()
+            except Exception as e:
+                analyses[futures[future]] = e
+                print(f"❌ {futures[future]}: {e}", file=sys.stderr)
+    
+    queries = {log: resolver.research_queries(analysis) for log, analysis in analyses.items()
+               if research and not isinstance(analysis, Exception)}
+    references_by_query = resolver.collect_references(
+        list(dict.fromkeys(query for log_queries in queries.values() for query in log_queries))
+    ) if queries else {}
+    
+    if jsonl_path is None and resolver.config['reporting']['generate_json']:
+        jsonl_path = output_dir / 'reports.jsonl'
+    
+    entries = []
+    records = []
+    report_names = set()
+    for log in logs:
+        analysis = analyses[log]
+        if isinstance(analysis, Exception):
+            entries.append({'log': str(log), 'error': str(analysis)})
+            continue
+        
+        references = list({reference['url']: {**reference, 'query': query}
+                           for query in queries.get(log, [])
+                           for reference in references_by_query[query]}.values())
+        report_name = None
+        if resolver.config['reporting']['generate_markdown']:
+            report_name = _report_name(log, report_names)
+            (output_dir / report_name).write_text(resolver.generate_comprehensive_report(analysis, references, []),
+                                                  encoding='utf-8')
+        entries.append({'log': str(log), 'report': report_name, 'analysis': analysis, 'references': references})
+        if jsonl_path:
+            records.append(resolver.build_report_data(analysis, references, [], source=str(log)))
+    
+    if records:
+        append_jsonl(jsonl_path, records)
+    
+    summary_path = output_dir / 'fleet_summary.md'
+    summary_path.write_text(resolver.generate_fleet_summary(entries), encoding='utf-8')
+    print(f"✅ {len(entries)} logs analyzed; reports and the fleet summary written to {output_dir}", file=sys.stderr)
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze pandas build logs and generate resolution reports")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--log-file', help="Build log to analyze ('-' for stdin, .gz supported)")
+    source.add_argument('--batch', metavar='DIR_OR_GLOB',
+                        help="Analyze every build log in a directory or matching a glob pattern")
+    parser.add_argument('--output-dir', default='resolver_reports',
+                        help="With --batch, where per-log reports and fleet_summary.md are written")
+    parser.add_argument('--jobs', type=int, help="With --batch, logs analyzed at the same time (default: CPU count)")
+    parser.add_argument('--research', action='store_true',
+                        help="Search Stack Overflow and GitHub for the problems found and list them as references")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes used to analyze large uncompressed logs in parallel")
+    parser.add_argument('--follow', action='store_true',
+                        help="Analyze the log while it is still being written, until it goes idle")
+    parser.add_argument('--idle-timeout', type=float, default=30,
+                        help="With --follow, seconds without new output before the build is considered done")
+    parser.add_argument('--stop-on-fatal', action='store_true',
+                        help="With --follow, stop at the first fatal build error")
+    parser.add_argument('--run-solutions', action='store_true',
+                        help="Try the recommended solutions, abandoning each at its first fatal build error")
+    parser.add_argument('--show-output', action='store_true',
+                        help="With --run-solutions, print pip's output as it runs")
+    parser.add_argument('--isolated', action='store_true',
+                        help="With --run-solutions, try solutions concurrently in throwaway virtualenvs")
+    parser.add_argument('--solution-workers', type=int,
+                        help="With --isolated, how many solutions run at the same time (default: from the config)")
+    parser.add_argument('--wheelhouse', help="Directory of shared wheels that solution attempts install from")
+    parser.add_argument('--populate-wheelhouse', action='store_true',
+                        help="Download the wheels the solutions need into --wheelhouse before running them")
+    parser.add_argument('--offline', action='store_true',
+                        help="Install only from --wheelhouse, never from PyPI")
+    parser.add_argument('--output', help="Write the Markdown report here instead of printing it")
+    parser.add_argument('--json-output', metavar='PATH',
+                        help="Write the JSON report here ('-' for stdout, which then needs --output); "
+                             "with reporting.generate_json it otherwise goes next to --output")
+    parser.add_argument('--jsonl', metavar='PATH',
+                        help="Append the JSON report of each analyzed log to this JSON Lines file")
+    parser.add_argument('--config', help="Resolver settings file (default: resolver_config.json if present)")
+    parser.add_argument('--knowledge-base', default=DEFAULT_KNOWLEDGE_BASE, metavar='PATH',
+                        help="SQLite record of past solution outcomes used to order solutions ('' to disable)")
+    args = parser.parse_args()
+    if (args.offline or args.populate_wheelhouse) and not args.wheelhouse:
+        parser.error("--offline and --populate-wheelhouse need --wheelhouse")
+    if args.batch and (args.follow or args.run_solutions or args.output):
+        parser.error("--batch cannot be combined with --follow, --run-solutions or --output")
+    if args.batch and args.json_output:
+        parser.error("--batch writes JSON reports with --jsonl, not --json-output")
+    
+    try:
+        config = load_config(args.config)
+    except ConfigError as e:
+        parser.error(str(e))
+    if args.json_output == '-' and config['reporting']['generate_markdown'] and not args.output:
+        parser.error("--json-output - needs --output for the Markdown report, which would otherwise share stdout")
+    
+    resolver = ComprehensivePandasResolver(wheelhouse=args.wheelhouse, offline=args.offline, config=config,
+                                           knowledge_base=args.knowledge_base)
+    if args.batch:
+        entries = run_batch(resolver, args.batch, args.output_dir, jobs=args.jobs, research=args.research,
+                            jsonl_path=args.jsonl)
+        return 0 if entries else 1
+    
+    if args.populate_wheelhouse:
+        resolver.prepare_wheelhouse()
+    if args.follow:
+        print(f"👀 Following {args.log_file}...", file=sys.stderr)
+        log_analysis = resolver.watch_log_file(args.log_file, stop_on_fatal=args.stop_on_fatal,
+                                               idle_timeout=args.idle_timeout)
+    else:
+        print(f"📄 Analyzing {args.log_file} with {args.workers} worker(s)...", file=sys.stderr)
+        try:
+            log_analysis = resolver.analyze_log_file(args.log_file, workers=args.workers)
+        except OSError as e:
+            print(f"❌ Cannot read {args.log_file}: {e.strerror or e}", file=sys.stderr)
+            return 1
+    
+    references = []
+    if args.research:
+        references_by_query = resolver.collect_references(resolver.research_queries(log_analysis))
+        references = list({reference['url']: {**reference, 'query': query}
+                           for query, results in references_by_query.items() for reference in results}.values())
+    
+    if args.run_solutions and args.isolated:
+        resolver.run_solutions_isolated(max_workers=args.solution_workers, log_analysis=log_analysis)
+    elif args.run_solutions:
+        resolver.run_solutions(watch=True, echo=args.show_output, log_analysis=log_analysis)
+    solutions = resolver.issue_data['solutions_tried']
+    markdown = config['reporting']['generate_markdown']
+    json_path = args.json_output
+    if json_path is None and config['reporting']['generate_json']:
+        # With nowhere else to go, JSON is printed only when it is the sole output
+        json_path = Path(args.output).with_suffix('.json') if args.output else (None if markdown else '-')
+    
+    if json_path or args.jsonl:
+        data = resolver.build_report_data(log_analysis, references, solutions, source=args.log_file)
+        if args.jsonl:
+            append_jsonl(args.jsonl, [data])
+        if json_path == '-':
+            print(json.dumps(data, indent=2, ensure_ascii=False))
+        elif json_path:
+            Path(json_path).write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+            print(f"✅ JSON report written to {json_path}", file=sys.stderr)
+    
+    if not markdown:
+        return 0
+    report = resolver.generate_comprehensive_report(log_analysis, references, solutions)
+    
+    if args.output:
+        Path(args.output).write_text(report, encoding='utf-8')
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
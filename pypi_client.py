@@ -0,0 +1,143 @@
+"""
+PyPI metadata client for the pandas build resolver.
+
+Each package's JSON document is fetched at most once per run and kept in the
+on-disk web cache for a few hours, trimmed to the fields the resolver needs:
+release versions, their files, and which Python versions have wheels. A
+wheel only counts if its platform tag also fits this machine, since a missing
+platform wheel is what makes pip build pandas from source.
+"""
+
+import functools
+import re
+import threading
+
+from packaging.tags import sys_tags
+
+from http_client import get_session
+from web_cache import TTLCache
+
+PYPI_BASE_URL = 'https://pypi.org'
+BUILD_PACKAGES = ('pandas', 'numpy', 'setuptools', 'cython')
+
+# name-version(-build)?-pythontag-abitag-platformtag.whl
+_wheel_filename = re.compile(
+    r'^(?P<name>.+?)-(?P<version>[^-]+)(?:-\d[^-]*)?-(?P<python>[^-]+)-(?P<abi>[^-]+)-(?P<platform>[^-]+)\.whl$'
+)
+
+
+def wheel_supports_python(filename, python_version):
+    """True if the wheel filename is installable on the given 'X.Y' Python version"""
+    match = _wheel_filename.match(filename)
+    if not match:
+        return False
+
+    major, minor = (int(part) for part in python_version.split('.')[:2])
+    for tag in match.group('python').split('.'):
+        if tag in (f'py{major}', f'py{major}{minor}', f'cp{major}{minor}'):
+            return True
+        # Stable-ABI wheels work on every CPython at or after their minimum version
+        if match.group('abi') == 'abi3' and tag.startswith(f'cp{major}'):
+            try:
+                if int(tag[len(f'cp{major}'):]) <= minor:
+                    return True
+            except ValueError:
+                pass
+    return False
+
+
+@functools.lru_cache(maxsize=1)
+def host_platform_tags():
+    """Platform tags of the wheels this machine can install, such as manylinux_2_17_x86_64"""
+    return frozenset(tag.platform for tag in sys_tags())
+
+
+def wheel_supports_platform(filename, platform_tags=None):
+    """True if the wheel filename is installable on one of platform_tags (this machine's by default)"""
+    match = _wheel_filename.match(filename)
+    if not match:
+        return False
+    platform_tags = host_platform_tags() if platform_tags is None else platform_tags
+    return any(tag == 'any' or tag in platform_tags for tag in match.group('platform').split('.'))
+
+
+class PyPIClient:
+    """Fetches and caches package metadata from the PyPI JSON API"""
+
+    def __init__(self, session=None, cache=None, base_url=PYPI_BASE_URL, timeout=10):
+        self.session = session or get_session()
+        self.cache = cache or TTLCache(table='pypi_metadata', ttl=6 * 3600, max_entries=200)
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._metadata = {}
+        self._lock = threading.Lock()
+
+    def get_metadata(self, package):
+        """Return trimmed metadata for package, fetching it once per client"""
+        package = package.lower()
+        with self._lock:
+            if package in self._metadata:
+                return self._metadata[package]
+
+            metadata = self.cache.get(f"{self.base_url}|{package}")
+            if metadata is None:
+                metadata = self._fetch(package)
+                self.cache.set(f"{self.base_url}|{package}", metadata)
+
+            self._metadata[package] = metadata
+            return metadata
+
+    def _fetch(self, package):
+        response = self.session.get(f"{self.base_url}/pypi/{package}/json", timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        info = data.get('info', {})
+
+        return {
+            'name': info.get('name', package),
+            'version': info.get('version'),
+            'summary': info.get('summary', ''),
+            'requires_python': info.get('requires_python'),
+            'releases': {
+                version: [{
+                    'filename': file['filename'],
+                    'packagetype': file.get('packagetype'),
+                    'requires_python': file.get('requires_python'),
+                    'yanked': file.get('yanked', False)
+                } for file in files]
+                for version, files in data.get('releases', {}).items()
+            }
+        }
+
+    def latest_version(self, package):
+        return self.get_metadata(package)['version']
+
+    def release_files(self, package, version=None):
+        metadata = self.get_metadata(package)
+        return metadata['releases'].get(version or metadata['version'], [])
+
+    def has_wheel(self, package, python_version, version=None, platform_tags=None):
+        """True if the release (latest by default) ships a wheel for python_version on platform_tags
+
+        platform_tags defaults to this machine's.
+        """
+        return any(
+            file['packagetype'] == 'bdist_wheel' and not file['yanked']
+            and wheel_supports_python(file['filename'], python_version)
+            and wheel_supports_platform(file['filename'], platform_tags)
+            for file in self.release_files(package, version)
+        )
+
+    def wheel_availability(self, package, python_versions, version=None):
+        """Map each 'X.Y' Python version to whether the release has a wheel for it on this platform"""
+        return {python_version: self.has_wheel(package, python_version, version)
+                for python_version in python_versions}
+
+    def latest_version_with_wheel(self, package, python_version):
+        """Newest non-pre-release version that has a wheel for python_version on this platform"""
+        releases = self.get_metadata(package)['releases']
+        candidates = [version for version in releases if re.fullmatch(r'[\d.]+', version)]
+        for version in sorted(candidates, key=lambda v: [int(part) for part in v.split('.')], reverse=True):
+            if self.has_wheel(package, python_version, version):
+                return version
+        return None
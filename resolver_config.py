@@ -0,0 +1,142 @@
+"""
+Configuration for the pandas build resolver.
+
+Settings are read from resolver_config.json and checked against the
+defaults below: every section and key must be known and every value must
+have the expected type and range. Sections and keys the file leaves out
+keep their default, so a deployment only needs to list what it changes.
+"""
+
+import copy
+import json
+import os
+
+DEFAULT_CONFIG_PATH = 'resolver_config.json'
+
+WEB_SOURCES = ('stackoverflow', 'github', 'pypi')
+
+DEFAULT_CONFIG = {
+    'web_search': {
+        'enabled': True,
+        'timeout': 15,
+        'max_results': 5,
+        'max_workers': 8,
+        'sources': list(WEB_SOURCES)
+    },
+    'solutions': {
+        'timeout': 300,
+        'stop_on_success': True,
+        'retry_failed': False,
+        'max_workers': 3
+    },
+    'reporting': {
+        'generate_markdown': True,
+        'generate_json': False,
+        'save_logs': True
+    },
+    'compatibility': {
+        'python_versions': [],
+        'pandas_versions': [],
+        'numpy_versions': []
+    }
+}
+
+
+class ConfigError(ValueError):
+    """Raised for a configuration file that cannot be used"""
+
+
+def _positive_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def _positive_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def _string_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) and item.strip() for item in value)
+
+
+# (check, description) for every known key
+RULES = {
+    'web_search': {
+        'enabled': (lambda v: isinstance(v, bool), 'true or false'),
+        'timeout': (_positive_number, 'a positive number of seconds'),
+        # Both search APIs return at most 100 results per page
+        'max_results': (lambda v: _positive_int(v) and v <= 100, 'an integer from 1 to 100'),
+        'max_workers': (_positive_int, 'a positive integer'),
+        'sources': (lambda v: _string_list(v) and set(v) <= set(WEB_SOURCES),
+                    f"a list drawn from {', '.join(WEB_SOURCES)}")
+    },
+    'solutions': {
+        'timeout': (_positive_number, 'a positive number of seconds'),
+        'stop_on_success': (lambda v: isinstance(v, bool), 'true or false'),
+        'retry_failed': (lambda v: isinstance(v, bool), 'true or false'),
+        'max_workers': (_positive_int, 'a positive integer')
+    },
+    'reporting': {
+        'generate_markdown': (lambda v: isinstance(v, bool), 'true or false'),
+        'generate_json': (lambda v: isinstance(v, bool), 'true or false'),
+        'save_logs': (lambda v: isinstance(v, bool), 'true or false')
+    },
+    'compatibility': {
+        'python_versions': (_string_list, 'a list of version strings'),
+        'pandas_versions': (_string_list, 'a list of version specifiers'),
+        'numpy_versions': (_string_list, 'a list of version specifiers')
+    }
+}
+
+
+def validate_config(overrides):
+    """The default configuration updated with overrides; raises ConfigError for unknown or invalid settings"""
+    if not isinstance(overrides, dict):
+        raise ConfigError("The configuration must be a JSON object")
+
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    problems = []
+    for section, settings in overrides.items():
+        if section not in RULES:
+            problems.append(f"unknown section '{section}'")
+            continue
+        if not isinstance(settings, dict):
+            problems.append(f"'{section}' must be an object")
+            continue
+        for key, value in settings.items():
+            if key not in RULES[section]:
+                problems.append(f"unknown setting '{section}.{key}'")
+                continue
+            check, description = RULES[section][key]
+            if not check(value):
+                problems.append(f"'{section}.{key}' must be {description}, not {value!r}")
+                continue
+            config[section][key] = value
+
+    if problems:
+        raise ConfigError("Invalid resolver configuration: " + "; ".join(problems))
+    return config
+
+
+def load_config(path=None):
+    """Load and validate a configuration file
+
+    Without a path, resolver_config.json in the working directory is used
+    if there is one and the defaults otherwise.
+    """
+    if path is None:
+        if not os.path.exists(DEFAULT_CONFIG_PATH):
+            return copy.deepcopy(DEFAULT_CONFIG)
+        path = DEFAULT_CONFIG_PATH
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            overrides = json.load(f)
+    except OSError as e:
+        raise ConfigError(f"Cannot read {path}: {e}") from e
+    except json.JSONDecodeError as e:
+        raise ConfigError(f"{path} is not valid JSON: {e}") from e
+
+    try:
+        return validate_config(overrides)
+    except ConfigError as e:
+        raise ConfigError(f"{path}: {e}") from None
@@ -0,0 +1,112 @@
+"""
+Ticket id generation for the problem solving platform.
+
+Ids look like TKT-20261019143836512-01H8Z3K9QW4T0000: the UTC time to the
+millisecond, then 80 bits in Crockford base32 made of a 30-bit node number
+drawn at random for each process and a 50-bit sequence. Within a process
+every id is greater than the one before, even if the clock steps back, and
+ids from any number of processes sort by creation time to the millisecond.
+Two processes can only produce the same id if they drew the same node
+number, so callers still rely on the UNIQUE constraint, and retry, for that
+one-in-a-billion case.
+
+Forked children draw a new node number, so worker pools never share one.
+"""
+
+import os
+import threading
+import time
+
+# Crockford's base32 alphabet, in ascending ASCII order so ids sort by value
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+# Both multiples of 5 bits, so each is a whole number of base32 characters
+NODE_BITS = 30
+SEQUENCE_BITS = 50
+
+# A new millisecond starts its sequence at a random value below this, leaving
+# at least 2**49 ids before the sequence could overflow into the next node
+SEQUENCE_START_LIMIT = 1 << (SEQUENCE_BITS - 1)
+
+# Attempts at inserting a ticket before a ticket id collision is reported
+TICKET_ID_ATTEMPTS = 5
+
+
+# Every pair of characters, indexed by the 10 bits they encode
+_PAIRS = [high + low for high in ALPHABET for low in ALPHABET]
+
+
+def _encode(number, length):
+    """number as length base32 characters; length must be even"""
+    pairs = []
+    for _ in range(length // 2):
+        number, bits = divmod(number, 1024)
+        pairs.append(_PAIRS[bits])
+    return ''.join(reversed(pairs))
+
+
+class TicketIdGenerator:
+    """Thread-safe source of strictly increasing ticket ids"""
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        # Also run in forked children, where another thread may have held the old lock
+        self._lock = threading.Lock()
+        self._node = _encode(int.from_bytes(os.urandom(4), 'big') >> (32 - NODE_BITS), NODE_BITS // 5)
+        self._last_ms = 0
+        self._sequence = 0
+        self._second = None
+        self._second_text = ''
+
+    def _timestamp(self, ms):
+        second, millisecond = divmod(ms, 1000)
+        if second != self._second:
+            self._second = second
+            self._second_text = time.strftime('%Y%m%d%H%M%S', time.gmtime(second))
+        return f"{self._second_text}{millisecond:03d}"
+
+    def _next(self):
+        ms = time.time_ns() // 1_000_000
+        if ms > self._last_ms:
+            self._last_ms = ms
+            self._sequence = int.from_bytes(os.urandom(7), 'big') % SEQUENCE_START_LIMIT
+        else:
+            # Same millisecond, or the clock went back: stay on the last timestamp and count up
+            self._sequence += 1
+            if self._sequence >> SEQUENCE_BITS:
+                self._last_ms += 1
+                self._sequence = 0
+        return f"TKT-{self._timestamp(self._last_ms)}-{self._node}{_encode(self._sequence, SEQUENCE_BITS // 5)}"
+
+    def new_id(self):
+        """The next ticket id"""
+        with self._lock:
+            return self._next()
+
+    def new_ids(self, count):
+        """The next count ticket ids, in ascending order"""
+        with self._lock:
+            return [self._next() for _ in range(count)]
+
+
+_generator = TicketIdGenerator()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_generator._reset)
+
+
+def new_ticket_id():
+    """The next ticket id of this process"""
+    return _generator.new_id()
+
+
+def new_ticket_ids(count):
+    """The next count ticket ids of this process, in ascending order"""
+    return _generator.new_ids(count)
+
+
+def is_ticket_id_collision(error):
+    """Whether an IntegrityError was raised by a duplicate ticket id"""
+    return 'problems.ticket_id' in str(error)
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Bulk ticket import for the problem solving platform.
+
+Two sources are supported, each written in large batches with one
+transaction per batch, every ticket getting its deadline calendar event in
+the same transaction:
+
+- resolver reports: the JSON reports main_pandas.py writes (.json files with
+  one report, .jsonl files with one per line). Every distinct build failure
+  becomes a ticket whose saved search results are the report's references
+  and whose attachment is the build log. Reports whose log signature matches
+  a failure that already has a ticket only add to its occurrence count, and
+  reports of clean builds are counted but not filed.
+- ticket backlogs: CSV or JSONL rows with title, description, category,
+  priority, deadline_days and submitted_by (a user's email). Secondary
+  indexes on the loaded tables are dropped for the load and rebuilt once at
+  the end instead of being updated row by row.
+
+Usage:
+    python ticket_import.py reports resolver_reports/reports.jsonl
+    python ticket_import.py reports 'nightly/*/reports.jsonl' --batch-size 1000 --no-logs
+    python ticket_import.py tickets backlog.csv --batch-size 20000
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from log_analysis import SIGNATURE_CATEGORIES, log_signature
+from database import PRIORITY_ORDER, init_db
+from ticket_ids import TICKET_ID_ATTEMPTS, is_ticket_id_collision, new_ticket_id, new_ticket_ids
+
+DEFAULT_DB_PATH = 'problem_solving.db'
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_TICKET_BATCH_SIZE = 10000
+
+# Tickets are filed by this account unless another user is named
+SERVICE_USER_EMAIL = 'build-resolver@localhost'
+SERVICE_USER_NAME = 'Build Resolver'
+
+# Larger build logs are attached as their last this many bytes, where the failure is
+MAX_LOG_ATTACHMENT_BYTES = 16 * 1024 * 1024
+
+TICKET_CATEGORY = 'Software'
+DEFAULT_CATEGORY = 'Other'
+DEFAULT_PRIORITY = 'Medium'
+DEADLINE_DAYS = 30
+MAX_TITLE_CHARS = 120
+
+# Tables a ticket backlog import fills, whose secondary indexes are rebuilt after the load
+BULK_TABLES = ('problems', 'calendar_events')
+
+
+def batched(items, size):
+    """Yield lists of up to size items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def connect(db_path):
+    """Connection in autocommit mode, so batches manage their own transactions"""
+    init_db(db_path)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    # With WAL a crash can lose the last commits but never corrupt the database
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+def _is_report(report):
+    return isinstance(report, dict) and isinstance(report.get('analysis'), dict)
+
+
+def iter_reports(paths):
+    """Yield every report in .json and .jsonl files; unreadable lines and non-reports are reported and skipped"""
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            if not path.endswith('.jsonl'):
+                report = json.load(f)
+                if _is_report(report):
+                    yield report
+                else:
+                    print(f"⚠️  {path}: skipping, not a report object with an analysis", file=sys.stderr)
+                continue
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    report = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"⚠️  {path}:{line_number}: skipping unreadable report: {e}", file=sys.stderr)
+                    continue
+                if _is_report(report):
+                    yield report
+                else:
+                    print(f"⚠️  {path}:{line_number}: skipping, not a report object with an analysis",
+                          file=sys.stderr)
+
+
+def is_build_failure(analysis):
+    """Whether an analyzed log shows a failed build: a fatal line, critical issues or error findings"""
+    return bool(analysis.get('fatal') or analysis.get('critical_issues')
+                or any(finding['category'] in SIGNATURE_CATEGORIES for finding in analysis.get('findings', [])))
+
+
+def ticket_fields(report):
+    """Title, description and priority of the ticket for a report"""
+    analysis = report['analysis']
+    fatal = analysis.get('fatal')
+    findings = analysis.get('findings', [])
+    errors = [finding for finding in findings if finding['category'] in SIGNATURE_CATEGORIES]
+    if fatal:
+        problem = fatal['text']
+    else:
+        problem = errors[0]['message'] if errors else analysis['critical_issues'][0]
+    title = f"Pandas build failure: {problem}"
+    if len(title) > MAX_TITLE_CHARS:
+        title = title[:MAX_TITLE_CHARS - 1] + '…'
+
+    environment = report.get('environment') or {}
+    lines = [
+        f"Imported from the build resolver report for {report.get('source') or 'an unnamed log'}.",
+        '',
+        f"Python: {(environment.get('python_version') or 'unknown').split()[0]}",
+        f"Platform: {environment.get('platform', 'unknown')}",
+        f"Log lines: {analysis.get('lines', 'unknown')}",
+    ]
+    if fatal:
+        lines.append(f"Fatal error at line {fatal['line']}: {fatal['text']}")
+    lines += [f"Critical: {issue}" for issue in analysis['critical_issues']]
+    lines += [f"Warning: {warning}" for warning in analysis['warnings']]
+    if findings:
+        lines += ['', 'Most frequent findings:']
+        lines += [f"- [{finding['category']}] × {finding['count']}: {finding['message']}" for finding in findings[:5]]
+    for solution in report.get('solutions', []):
+        outcome = 'cancelled' if solution.get('cancelled') else ('worked' if solution['success'] else 'failed')
+        lines.append(f"Solution tried: {solution['solution']} ({outcome})")
+
+    priority = 'High' if fatal else report.get('severity', 'Medium')
+    return title, '\n'.join(lines), priority
+
+
+def reference_snippet(reference):
+    """Short summary of a reference's metadata for the search_results snippet"""
+    if reference.get('source') == 'GitHub':
+        return f"Issue {reference.get('state', 'unknown')}, opened {reference.get('created_at', 'unknown')}"
+    if reference.get('source') == 'Stack Overflow':
+        return f"Score {reference.get('score', 0)}, {reference.get('answer_count', 0)} answers"
+    return reference.get('title', '')
+
+
+def read_log_attachment(source):
+    """(filename, bytes, MIME type) for a report's build log, or None if it cannot be read"""
+    if not source or source == '-':
+        return None
+    try:
+        with open(source, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - MAX_LOG_ATTACHMENT_BYTES))
+            data = f.read()
+    except OSError:
+        return None
+
+    filename = os.path.basename(source)
+    if source.endswith('.gz'):
+        if size > MAX_LOG_ATTACHMENT_BYTES:
+            # The tail of a gzip stream cannot be decompressed on its own
+            return None
+        return filename, data, 'application/gzip'
+    if size > MAX_LOG_ATTACHMENT_BYTES:
+        filename = f"{filename}.tail.log"
+    return filename, data, 'text/plain'
+
+
+def service_user_id(conn, email=None):
+    """Id of the user importing tickets; the service account is created on first use"""
+    if email:
+        row = conn.execute('SELECT id FROM users WHERE email = ?', (email,)).fetchone()
+        if row is None:
+            raise ValueError(f"No user with email {email}")
+        return row[0]
+    # '!' never matches a password hash, so nobody can log in as the service account
+    conn.execute("INSERT OR IGNORE INTO users (email, password, name, role) VALUES (?, '!', ?, 'user')",
+                 (SERVICE_USER_EMAIL, SERVICE_USER_NAME))
+    return conn.execute('SELECT id FROM users WHERE email = ?', (SERVICE_USER_EMAIL,)).fetchone()[0]
+
+
+def report_signature(report):
+    """Deduplication key of a report: its log signature, or for a failure without one
+    (critical issues but no findings) an identity of the report itself, so importing the
+    same file twice adds nothing
+    """
+    signature = log_signature(report['analysis'])
+    if signature:
+        return signature
+    identity = f"{report.get('source')}\0{report.get('generated_at')}"
+    return 'report:' + hashlib.sha1(identity.encode('utf-8')).hexdigest()[:12]
+
+
+def _insert_ticket(conn, title, description, priority, submitted_by, deadline):
+    for attempt in range(TICKET_ID_ATTEMPTS):
+        ticket_id = new_ticket_id()
+        try:
+            cursor = conn.execute('''
+                INSERT INTO problems (ticket_id, title, description, category, priority, submitted_by, deadline)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (ticket_id, title, description, TICKET_CATEGORY, priority, submitted_by, deadline))
+            return cursor.lastrowid, ticket_id
+        except sqlite3.IntegrityError as e:
+            if not is_ticket_id_collision(e) or attempt == TICKET_ID_ATTEMPTS - 1:
+                raise
+
+
+def add_deadline_events(conn, after_id):
+    """Add the deadline calendar event submit_problem's callers add, for every ticket with id above after_id"""
+    return conn.execute('''
+        INSERT INTO calendar_events (problem_id, title, description, event_date, created_by)
+        SELECT id, 'Deadline: ' || title, 'Final deadline for solving: ' || description, deadline, submitted_by
+        FROM problems WHERE id > ?
+    ''', (after_id,)).rowcount
+
+
+def _last_problem_id(conn):
+    # Inside a write transaction every row above this id is the transaction's own
+    return conn.execute('SELECT COALESCE(MAX(id), 0) FROM problems').fetchone()[0]
+
+
+def import_batch(conn, reports, submitted_by, attach_logs=True):
+    """File one batch of reports in a single transaction; returns counts of what was written"""
+    counts = {'tickets': 0, 'duplicates': 0, 'clean': 0, 'search_results': 0, 'attachments': 0, 'events': 0}
+    deadline = datetime.now() + timedelta(days=DEADLINE_DAYS)
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        last_id = _last_problem_id(conn)
+        for report in reports:
+            if not is_build_failure(report['analysis']):
+                # Nothing went wrong in this build; there is no problem to file
+                counts['clean'] += 1
+                continue
+            signature = report_signature(report)
+            cursor = conn.execute('''
+                UPDATE imported_reports SET occurrences = occurrences + 1, last_seen = CURRENT_TIMESTAMP
+                WHERE log_signature = ?
+            ''', (signature,))
+            if cursor.rowcount:
+                counts['duplicates'] += 1
+                continue
+
+            title, description, priority = ticket_fields(report)
+            problem_id, _ = _insert_ticket(conn, title, description, priority, submitted_by, deadline)
+            counts['tickets'] += 1
+            conn.execute('INSERT INTO imported_reports (log_signature, problem_id) VALUES (?, ?)',
+                         (signature, problem_id))
+
+            references = report.get('references', [])
+            conn.executemany('''
+                INSERT INTO search_results (problem_id, search_query, result_title, result_url, result_snippet, search_engine)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(problem_id, reference.get('query', ''), reference['title'], reference['url'],
+                   reference_snippet(reference), reference['source']) for reference in references])
+            counts['search_results'] += len(references)
+
+            attachment = read_log_attachment(report.get('source')) if attach_logs else None
+            if attachment:
+                filename, data, file_type = attachment
+                conn.execute('''
+                    INSERT INTO file_attachments (problem_id, filename, file_data, file_type, uploaded_by)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (problem_id, filename, data, file_type, submitted_by))
+                counts['attachments'] += 1
+        counts['events'] = add_deadline_events(conn, last_id)
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    return counts
+
+
+def import_reports(reports, db_path=DEFAULT_DB_PATH, batch_size=DEFAULT_BATCH_SIZE, user_email=None,
+                   attach_logs=True):
+    """Import an iterable of reports as tickets, committing every batch_size reports
+
+    A batch that fails is rolled back as a whole and the error is raised;
+    earlier batches stay committed. Returns totals of what was written.
+    """
+    conn = connect(db_path)
+    totals = {'reports': 0, 'tickets': 0, 'duplicates': 0, 'clean': 0, 'search_results': 0, 'attachments': 0,
+              'events': 0}
+    try:
+        submitted_by = service_user_id(conn, user_email)
+        for batch in batched(reports, batch_size):
+            for key, count in import_batch(conn, batch, submitted_by, attach_logs).items():
+                totals[key] += count
+            totals['reports'] += len(batch)
+    finally:
+        conn.close()
+    return totals
+
+
+def iter_ticket_rows(path, chunk_size=DEFAULT_TICKET_BATCH_SIZE):
+    """Yield ticket rows as dicts from a CSV file (read in chunks) or a JSONL file"""
+    if path.endswith('.jsonl'):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    for chunk in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_size):
+        yield from chunk.to_dict('records')
+
+
+def ticket_values(row, number, users, default_user, now):
+    """(title, description, category, priority, submitted_by, deadline) for a ticket row; raises ValueError"""
+    if not isinstance(row, dict):
+        raise ValueError(f"Ticket {number}: expected an object with ticket fields, not {type(row).__name__}")
+    title = str(row.get('title') or '').strip()
+    description = str(row.get('description') or '').strip()
+    if not title or not description:
+        raise ValueError(f"Ticket {number}: title and description are required")
+
+    priority = str(row.get('priority') or DEFAULT_PRIORITY).strip().capitalize()
+    if priority not in PRIORITY_ORDER:
+        raise ValueError(f"Ticket {number}: unknown priority {row.get('priority')!r}")
+
+    deadline_days = row.get('deadline_days')
+    if deadline_days is None or deadline_days == '':
+        deadline_days = DEADLINE_DAYS
+    if isinstance(deadline_days, float) and deadline_days.is_integer():
+        deadline_days = int(deadline_days)
+    # CSV gives strings and JSONL numbers; anything else, bools and fractions are rejected, not truncated
+    if isinstance(deadline_days, bool) or not isinstance(deadline_days, (int, str)):
+        raise ValueError(f"Ticket {number}: deadline_days must be a whole number")
+    try:
+        deadline_days = int(deadline_days)
+    except (TypeError, ValueError):
+        raise ValueError(f"Ticket {number}: deadline_days must be a whole number") from None
+
+    email = str(row.get('submitted_by') or '').strip()
+    if email and email not in users:
+        raise ValueError(f"Ticket {number}: no user with email {email}")
+
+    return (title, description, str(row.get('category') or DEFAULT_CATEGORY).strip(), priority,
+            users[email] if email else default_user, str(now + timedelta(days=deadline_days)))
+
+
+def insert_ticket_batch(conn, values, calendar_events=True):
+    """Insert prepared ticket rows, and their deadline events, in a single transaction
+
+    A batch that hits a ticket id already in the database (which takes two
+    processes drawing the same node number, see ticket_ids) is rolled back
+    and retried with new ids.
+    """
+    for attempt in range(TICKET_ID_ATTEMPTS):
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            last_id = _last_problem_id(conn)
+            conn.executemany('''
+                INSERT INTO problems (ticket_id, title, description, category, priority, submitted_by, deadline)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', [(ticket_id,) + row for ticket_id, row in zip(new_ticket_ids(len(values)), values)])
+            events = add_deadline_events(conn, last_id) if calendar_events else 0
+            conn.execute('COMMIT')
+            return events
+        except sqlite3.IntegrityError as e:
+            conn.execute('ROLLBACK')
+            if not is_ticket_id_collision(e) or attempt == TICKET_ID_ATTEMPTS - 1:
+                raise
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+
+def import_tickets(rows, db_path=DEFAULT_DB_PATH, batch_size=DEFAULT_TICKET_BATCH_SIZE, user_email=None,
+                   calendar_events=True, defer_indexes=True):
+    """Import an iterable of ticket rows, committing every batch_size rows
+
+    Rows without submitted_by are filed by user_email or the service account.
+    With defer_indexes the secondary indexes on the loaded tables are dropped
+    for the duration and rebuilt at the end, even if the import fails. A
+    batch with an invalid row is not written and the error is raised; earlier
+    batches stay committed. Returns counts of what was written.
+    """
+    conn = connect(db_path)
+    totals = {'tickets': 0, 'events': 0}
+    try:
+        default_user = service_user_id(conn, user_email)
+        users = dict(conn.execute('SELECT email, id FROM users'))
+
+        deferred = []
+        if defer_indexes:
+            placeholders = ', '.join('?' * len(BULK_TABLES))
+            deferred = conn.execute(f'''
+                SELECT name, sql FROM sqlite_master
+                WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+            ''', BULK_TABLES).fetchall()
+            for name, _ in deferred:
+                conn.execute(f'DROP INDEX {name}')
+        try:
+            number = 0
+            for batch in batched(rows, batch_size):
+                now = datetime.now()
+                values = [ticket_values(row, number + offset, users, default_user, now)
+                          for offset, row in enumerate(batch, 1)]
+                totals['events'] += insert_ticket_batch(conn, values, calendar_events)
+                totals['tickets'] += len(values)
+                number += len(batch)
+        finally:
+            for _, sql in deferred:
+                conn.execute(sql)
+    finally:
+        conn.close()
+    return totals
+
+
+def _expand(patterns):
+    paths = []
+    for pattern in patterns:
+        paths += sorted(glob.glob(pattern, recursive=True)) or [pattern]
+    return paths
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--db', default=DEFAULT_DB_PATH, help="Ticket database")
+    common.add_argument('--user-email', help="File tickets as this existing user instead of the service account")
+
+    parser = argparse.ArgumentParser(description="Bulk import tickets into the problem solving platform")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    reports = subparsers.add_parser('reports', parents=[common], help="Import pandas build resolver reports")
+    reports.add_argument('paths', nargs='+', help="JSON or JSONL report files, or glob patterns")
+    reports.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Reports written per transaction")
+    reports.add_argument('--no-logs', action='store_true', help="Do not attach the build logs")
+
+    tickets = subparsers.add_parser('tickets', parents=[common], help="Import a ticket backlog from CSV or JSONL")
+    tickets.add_argument('paths', nargs='+', help="CSV or JSONL ticket files, or glob patterns")
+    tickets.add_argument('--batch-size', type=int, default=DEFAULT_TICKET_BATCH_SIZE,
+                         help="Tickets written per transaction")
+    tickets.add_argument('--no-events', action='store_true', help="Do not add deadline calendar events")
+    tickets.add_argument('--keep-indexes', action='store_true',
+                         help="Update indexes row by row instead of rebuilding them after the load")
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    paths = _expand(args.paths)
+    started = time.perf_counter()
+    try:
+        if args.command == 'reports':
+            totals = import_reports(iter_reports(paths), db_path=args.db, batch_size=args.batch_size,
+                                    user_email=args.user_email, attach_logs=not args.no_logs)
+        else:
+            rows = (row for path in paths for row in iter_ticket_rows(path, args.batch_size))
+            totals = import_tickets(rows, db_path=args.db, batch_size=args.batch_size, user_email=args.user_email,
+                                    calendar_events=not args.no_events, defer_indexes=not args.keep_indexes)
+    except KeyError as e:
+        print(f"❌ Import failed: a report has no {e} field; nothing from its batch was imported", file=sys.stderr)
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"❌ Import failed: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if args.command == 'reports':
+        print(f"✅ {totals['reports']} reports: {totals['tickets']} new tickets, {totals['duplicates']} repeats of "
+              f"known failures, {totals['clean']} clean builds skipped, {totals['search_results']} references, "
+              f"{totals['attachments']} logs attached",
+              file=sys.stderr)
+    else:
+        print(f"✅ {totals['tickets']} tickets and {totals['events']} calendar events imported in {elapsed:.1f}s "
+              f"({totals['tickets'] / max(elapsed, 1e-9):.0f} tickets/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Persistent caches for web research results.
+
+Entries live in a small SQLite database so they survive Streamlit reruns and
+are shared by everyone using the same deployment, including the pandas build
+resolver, which stores its scraped search results in the same page cache.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+
+
+class TTLCache:
+    """SQLite-backed key/value cache with a time-to-live and LRU eviction"""
+
+    def __init__(self, db_path='web_cache.db', table='cache', ttl=3600, max_entries=1000, max_bytes=None):
+        self.db_path = db_path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._init_table()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _init_table(self):
+        conn = self._connect()
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{self.table}_accessed ON {self.table} (accessed_at)')
+        conn.commit()
+        conn.close()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def get_entry(self, key):
+        """Return (value, age_in_seconds) for key, or None if missing or expired"""
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(f'SELECT value, created_at FROM {self.table} WHERE key = ?', (key,)).fetchone()
+
+        if row is None or now - row[1] > self.ttl:
+            if row is not None:
+                conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                conn.commit()
+            conn.close()
+            self._count(False)
+            return None
+
+        conn.execute(f'UPDATE {self.table} SET accessed_at = ? WHERE key = ?', (now, key))
+        conn.commit()
+        conn.close()
+        self._count(True)
+        return json.loads(row[0]), now - row[1]
+
+    def set(self, key, value):
+        """Store value under key and evict the least recently used overflow"""
+        now = time.time()
+        conn = self._connect()
+        conn.execute(f'''
+            INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at)
+            VALUES (?, ?, ?, ?)
+        ''', (key, json.dumps(value), now, now))
+        conn.execute(f'DELETE FROM {self.table} WHERE created_at < ?', (now - self.ttl,))
+        conn.execute(f'''
+            DELETE FROM {self.table} WHERE key IN (
+                SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+        ''', (self.max_entries,))
+        if self.max_bytes:
+            conn.execute(f'''
+                DELETE FROM {self.table} WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(LENGTH(value)) OVER (ORDER BY accessed_at DESC) AS running_bytes
+                        FROM {self.table}
+                    ) WHERE running_bytes > ?
+                )
+            ''', (self.max_bytes,))
+        conn.commit()
+        conn.close()
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute(f'DELETE FROM {self.table}')
+        conn.commit()
+        conn.close()
+
+    def stats(self):
+        conn = self._connect()
+        size, total_bytes = conn.execute(f'SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM {self.table}').fetchone()
+        conn.close()
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': size, 'bytes': total_bytes}
+
+
+class SearchCache(TTLCache):
+    """Cache of search engine results keyed by normalized query and result count"""
+
+    def __init__(self, db_path='web_cache.db', ttl=6 * 3600, max_entries=2000):
+        super().__init__(db_path, table='search_cache', ttl=ttl, max_entries=max_entries)
+
+    @staticmethod
+    def make_key(query, max_results):
+        normalized = re.sub(r'\s+', ' ', query).strip().lower()
+        return f"{normalized}|{int(max_results)}"
+
+    def lookup(self, query, max_results):
+        return self.get(self.make_key(query, max_results))
+
+    def store(self, query, max_results, results):
+        self.set(self.make_key(query, max_results), results)
+
+
+class PageCache(TTLCache):
+    """Cache of parsed page content with HTTP validators for conditional revalidation.
+
+    Entries younger than fresh_for are served without touching the network;
+    older ones are revalidated with If-None-Match / If-Modified-Since until
+    they reach ttl, after which they are dropped.
+    """
+
+    def __init__(self, db_path='web_cache.db', fresh_for=3600, ttl=7 * 24 * 3600,
+                 max_entries=5000, max_bytes=50 * 1024 * 1024):
+        super().__init__(db_path, table='page_cache', ttl=ttl, max_entries=max_entries,
+                         max_bytes=max_bytes)
+        self.fresh_for = fresh_for
+        self.revalidated = 0
+
+    @staticmethod
+    def make_key(url, params=None, variant=''):
+        query = json.dumps(params, sort_keys=True) if params else ''
+        return f"{variant}|{url}|{query}"
+
+    def mark_revalidated(self):
+        with self._lock:
+            self.revalidated += 1
+
+    def stats(self):
+        stats = super().stats()
+        stats['revalidated'] = self.revalidated
+        return stats
+
+
+def fetch_with_cache(session, cache, url, parse, params=None, headers=None, timeout=10, variant=''):
+    """GET url through a PageCache and return the parsed payload.
+
+    parse(response) turns a response into a JSON-serializable payload, or
+    None when the response is not usable (for example a non-200 status).
+    Only usable 200 responses are stored, together with their ETag and
+    Last-Modified headers; a 304 answer refreshes the stored entry.
+    """
+    key = cache.make_key(url, params, variant)
+    entry = cache.get_entry(key)
+    if entry and entry[1] < cache.fresh_for:
+        return entry[0]['payload']
+
+    request_headers = dict(headers or {})
+    if entry:
+        if entry[0].get('etag'):
+            request_headers['If-None-Match'] = entry[0]['etag']
+        if entry[0].get('last_modified'):
+            request_headers['If-Modified-Since'] = entry[0]['last_modified']
+
+    with session.get(url, params=params, headers=request_headers, timeout=timeout, stream=True) as response:
+        if response.status_code == 304 and entry:
+            cache.mark_revalidated()
+            cache.set(key, entry[0])
+            return entry[0]['payload']
+
+        payload = parse(response)
+        if response.status_code == 200 and payload is not None:
+            cache.set(key, {
+                'payload': payload,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            })
+        return payload
@@ -0,0 +1,171 @@
+"""
+Local wheelhouse for the pandas build resolver.
+
+Wheels for the packages the resolver's solutions install are downloaded once
+into a shared directory and listed in a PEP 503 "simple" index whose links
+carry each file's sha256. Solution attempts install from it with
+--find-links (falling back to PyPI) or, offline, with --index-url pointing at
+the local index, where pip checks every wheel against its recorded hash.
+Several resolver runs can share one wheelhouse: files are only ever added,
+and the index is rebuilt from whatever is on disk.
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+
+DEFAULT_WHEELHOUSE = 'wheelhouse'
+
+
+def normalize_project_name(name):
+    """PEP 503 normalized project name"""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def file_sha256(path, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def requirements_from_command(command):
+    """The requirement specifiers of a 'pip install ...' command line, or [] for editable/local installs"""
+    arguments = shlex.split(command)[2:]
+    if any(token in ('-e', '.') or token.startswith('git+') for token in arguments):
+        return []
+    return [token for token in arguments if not token.startswith('-')]
+
+
+class Wheelhouse:
+    """A directory of downloaded wheels with a hash manifest and a simple index"""
+
+    def __init__(self, root=DEFAULT_WHEELHOUSE):
+        self.root = Path(root).resolve()
+        self.wheels_dir = self.root / 'wheels'
+        self.index_dir = self.root / 'simple'
+        self.manifest_path = self.root / 'manifest.json'
+
+    @property
+    def index_url(self):
+        return self.index_dir.as_uri() + '/'
+
+    def exists(self):
+        return self.manifest_path.exists()
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def populate(self, requirement_sets, pip=None, timeout=600):
+        """Download wheels for each list of requirement specifiers and rebuild the index
+
+        Each set is resolved separately, so conflicting pins from different
+        solutions can share the wheelhouse. Files already present are not
+        downloaded again. Returns {requirement string: error or None}.
+        """
+        self.wheels_dir.mkdir(parents=True, exist_ok=True)
+        pip = pip or [sys.executable, '-m', 'pip']
+        errors = {}
+        for requirements in requirement_sets:
+            if not requirements:
+                continue
+            key = ' '.join(requirements)
+            print(f"📦 Fetching wheels for {key}")
+            result = subprocess.run(
+                pip + ['download', '--only-binary=:all:', '--dest', str(self.wheels_dir),
+                       '--find-links', str(self.wheels_dir)] + list(requirements),
+                capture_output=True, text=True, timeout=timeout
+            )
+            errors[key] = None if result.returncode == 0 else (result.stderr.strip().splitlines() or ['failed'])[-1]
+            if errors[key]:
+                print(f"  ⚠️  {errors[key]}")
+        self.build_index()
+        return errors
+
+    def add(self, path):
+        """Copy a wheel file into the wheelhouse unless an identical one is already there"""
+        self.wheels_dir.mkdir(parents=True, exist_ok=True)
+        source = Path(path)
+        target = self.wheels_dir / source.name
+        if target.exists() and file_sha256(target) == file_sha256(source):
+            return target
+        partial = target.with_name(f".{target.name}.{os.getpid()}.part")
+        partial.write_bytes(source.read_bytes())
+        os.replace(partial, target)
+        return target
+
+    def build_index(self):
+        """Hash every wheel and write the manifest and the simple index
+
+        Hashes are reused for files whose size and modification time have
+        not changed since the last build.
+        """
+        previous = self.load_manifest()
+        manifest = {}
+        for wheel in sorted(self.wheels_dir.glob('*.whl')):
+            stat = wheel.stat()
+            entry = previous.get(wheel.name)
+            if not entry or entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime:
+                entry = {'sha256': file_sha256(wheel), 'size': stat.st_size, 'mtime': stat.st_mtime}
+            entry['project'] = normalize_project_name(wheel.name.split('-')[0])
+            manifest[wheel.name] = entry
+
+        projects = {}
+        for filename, entry in manifest.items():
+            projects.setdefault(entry['project'], []).append(filename)
+
+        for project, filenames in projects.items():
+            project_dir = self.index_dir / project
+            project_dir.mkdir(parents=True, exist_ok=True)
+            links = '\n'.join(
+                f'<a href="{(self.wheels_dir / name).as_uri()}#sha256={manifest[name]["sha256"]}">{html.escape(name)}</a><br>'
+                for name in filenames
+            )
+            self._write_atomic(project_dir / 'index.html',
+                               f'<!DOCTYPE html>\n<html><body>\n{links}\n</body></html>\n')
+
+        root_links = '\n'.join(f'<a href="{project}/">{project}</a><br>' for project in sorted(projects))
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(self.index_dir / 'index.html',
+                           f'<!DOCTYPE html>\n<html><body>\n{root_links}\n</body></html>\n')
+        self._write_atomic(self.manifest_path, json.dumps(manifest, indent=1, sort_keys=True))
+        return manifest
+
+    def verify(self, remove=False):
+        """Return the wheels whose contents no longer match the manifest, optionally deleting them"""
+        corrupted = []
+        for filename, entry in self.load_manifest().items():
+            path = self.wheels_dir / filename
+            if path.exists() and file_sha256(path) != entry['sha256']:
+                corrupted.append(filename)
+                if remove:
+                    path.unlink()
+        if remove and corrupted:
+            self.build_index()
+        return corrupted
+
+    def pip_args(self, offline=False):
+        """pip install arguments that take wheels from this wheelhouse
+
+        Offline, pip may only use the local hash-checked index; otherwise the
+        wheelhouse is searched in addition to PyPI.
+        """
+        if offline:
+            return ['--index-url', self.index_url]
+        return ['--find-links', str(self.wheels_dir)]
+
+    def _write_atomic(self, path, text):
+        partial = path.with_name(f".{path.name}.{os.getpid()}.part")
+        partial.write_text(text, encoding='utf-8')
+        os.replace(partial, path)